@@ -5,14 +5,26 @@ Rotates SSH keys for Splunk user on target hosts
 """
 
 import os
+import pwd
 import sys
+import shutil
 import subprocess
+import time
 import argparse
+import functools
 import logging
+import re
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+except ImportError:
+    serialization = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,13 +32,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# SSH paths for the invoking user
+SSH_DIR = Path.home() / '.ssh'
+AUTHORIZED_KEYS = SSH_DIR / 'authorized_keys'
+SSH_CONFIG = SSH_DIR / 'config'
+
+# Matches an IdentityFile directive anywhere in an SSH config
+_IDFILE_RE = re.compile(r'(?m)^[ \t]*IdentityFile[ \t]+.*$')
+
+# Owner applied to files written under ~/.ssh, resolved once per run
+SSH_USER = os.getenv('USER', 'splunk')
+try:
+    _PW = pwd.getpwnam(SSH_USER)
+    _UID, _GID = _PW.pw_uid, _PW.pw_gid
+except KeyError:
+    _UID = _GID = -1
+
 
 def run_command(cmd, timeout=300):
-    """Run a command and return the result"""
+    """Run a command and return the result
+    
+    A string is run through the shell; an argv list is executed directly.
+    """
     try:
         result = subprocess.run(
             cmd, 
-            shell=True, 
+            shell=isinstance(cmd, str), 
             capture_output=True, 
             text=True, 
             timeout=timeout
@@ -50,133 +81,208 @@ def run_command(cmd, timeout=300):
         }
 
 
+def _copy(src, dst):
+    """Copy a file in-process, using sendfile where the platform supports it"""
+    if not hasattr(os, 'sendfile'):
+        shutil.copyfile(src, dst)
+        return
+    
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        size = os.fstat(s.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+@functools.lru_cache(maxsize=None)
+def _key_paths(key_type):
+    """Return the (private, public) key paths for a key type"""
+    private_key_path = SSH_DIR / f'id_{key_type}'
+    return private_key_path, SSH_DIR / f'id_{key_type}.pub'
+
+
+def _generate_key(key_type, key_size):
+    """Generate a private key of the given type in-process"""
+    if key_type == 'rsa':
+        return rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    if key_type == 'ed25519':
+        return ed25519.Ed25519PrivateKey.generate()
+    if key_type == 'ecdsa':
+        curves = {384: ec.SECP384R1, 521: ec.SECP521R1}
+        return ec.generate_private_key(curves.get(key_size, ec.SECP256R1)())
+    raise ValueError(f"Unsupported key type: {key_type}")
+
+
+def _write_private(path, data, chown=False):
+    """Atomically replace path with data bytes, with 0600 permissions set before the rename"""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fchmod(fd, 0o600)
+        if chown and _UID != -1:
+            os.fchown(fd, _UID, _GID)
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
 def backup_existing_keys(backup_dir):
     """Backup existing SSH keys"""
     logger.info("Backing up existing SSH keys...")
     
     # Create backup directory
     os.makedirs(backup_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Backup authorized_keys
-    authorized_keys_path = Path.home() / '.ssh' / 'authorized_keys'
-    if authorized_keys_path.exists():
-        backup_path = Path(backup_dir) / f'authorized_keys_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
-        result = run_command(f'cp {authorized_keys_path} {backup_path}')
-        if result['exit_code'] == 0:
-            logger.info(f"Backed up authorized_keys to {backup_path}")
-        else:
-            logger.error(f"Failed to backup authorized_keys: {result['stderr']}")
-            return False
+    # Backup authorized_keys and private key; the copies are independent
+    private_key_path, _ = _key_paths('rsa')
+    candidates = [
+        ('authorized_keys', AUTHORIZED_KEYS, Path(backup_dir) / f'authorized_keys_{timestamp}'),
+        ('private key', private_key_path, Path(backup_dir) / f'id_rsa_{timestamp}'),
+    ]
+    jobs = [job for job in candidates if job[1].exists()]
     
-    # Backup private key
-    private_key_path = Path.home() / '.ssh' / 'id_rsa'
-    if private_key_path.exists():
-        backup_path = Path(backup_dir) / f'id_rsa_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
-        result = run_command(f'cp {private_key_path} {backup_path}')
-        if result['exit_code'] == 0:
-            logger.info(f"Backed up private key to {backup_path}")
-        else:
-            logger.error(f"Failed to backup private key: {result['stderr']}")
+    def copy_job(job):
+        try:
+            _copy(job[1], job[2])
+            return None
+        except OSError as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        errors = list(executor.map(copy_job, jobs))
+    
+    for (name, _, backup_path), error in zip(jobs, errors):
+        if error is not None:
+            logger.error("Failed to backup %s: %s", name, error)
             return False
+        logger.info("Backed up %s to %s", name, backup_path)
     
     return True
 
 
 def generate_new_keypair(key_type='rsa', key_size=4096, comment='siemply-rotated'):
     """Generate new SSH key pair"""
-    logger.info(f"Generating new {key_type} key pair...")
+    logger.info("Generating new %s key pair...", key_type)
     
     # Remove existing keys
-    private_key_path = Path.home() / '.ssh' / f'id_{key_type}'
-    public_key_path = Path.home() / '.ssh' / f'id_{key_type}.pub'
+    private_key_path, public_key_path = _key_paths(key_type)
     
     if private_key_path.exists():
         private_key_path.unlink()
     if public_key_path.exists():
         public_key_path.unlink()
     
-    # Generate new key pair
-    cmd = f'ssh-keygen -t {key_type} -b {key_size} -f {private_key_path} -N "" -C "{comment}"'
-    result = run_command(cmd)
+    # Fall back to ssh-keygen when cryptography is not installed
+    if serialization is None:
+        cmd = f'ssh-keygen -t {key_type} -b {key_size} -f {private_key_path} -N "" -C "{comment}"'
+        result = run_command(cmd)
+        
+        if result['exit_code'] == 0:
+            logger.info("New key pair generated successfully")
+            return True
+        else:
+            logger.error("Failed to generate new key pair: %s", result['stderr'])
+            return False
     
-    if result['exit_code'] == 0:
-        logger.info("New key pair generated successfully")
-        return True
-    else:
-        logger.error(f"Failed to generate new key pair: {result['stderr']}")
+    # Generate new key pair
+    try:
+        private_key = _generate_key(key_type, key_size)
+        private_bytes = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.OpenSSH,
+            serialization.NoEncryption()
+        )
+        public_bytes = private_key.public_key().public_bytes(
+            serialization.Encoding.OpenSSH,
+            serialization.PublicFormat.OpenSSH
+        ) + f' {comment}\n'.encode()
+        
+        for path, data, mode in ((private_key_path, private_bytes, 0o600),
+                                 (public_key_path, public_bytes, 0o644)):
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+    except (ValueError, OSError) as e:
+        logger.error("Failed to generate new key pair: %s", e)
         return False
+    
+    logger.info("New key pair generated successfully")
+    return True
 
 
 def update_authorized_keys(public_key_path):
-    """Update authorized_keys file with new public key"""
+    """Update authorized_keys file with new public key
+    
+    Returns the new public key on success so callers don't need to re-read it.
+    """
     logger.info("Updating authorized_keys file...")
     
-    authorized_keys_path = Path.home() / '.ssh' / 'authorized_keys'
+    authorized_keys_path = AUTHORIZED_KEYS
     
     # Read existing authorized_keys
-    existing_keys = []
-    if authorized_keys_path.exists():
-        with open(authorized_keys_path, 'r') as f:
-            existing_keys = f.readlines()
+    try:
+        existing_keys = authorized_keys_path.read_text()
+    except FileNotFoundError:
+        existing_keys = ''
     
     # Read new public key
     with open(public_key_path, 'r') as f:
         new_key = f.read().strip()
     
     # Remove old keys with same comment
-    comment = new_key.split()[-1] if len(new_key.split()) > 2 else ''
-    filtered_keys = [key for key in existing_keys if not key.strip().endswith(comment)]
+    head, sep, tail = new_key.rpartition(' ')
+    comment = tail if sep and ' ' in head else ''
+    filtered_keys = [
+        line for line in existing_keys.splitlines() if not line.rstrip().endswith(comment)
+    ]
     
     # Add new key
-    filtered_keys.append(new_key + '\n')
-    
-    # Write updated authorized_keys
-    with open(authorized_keys_path, 'w') as f:
-        f.writelines(filtered_keys)
+    filtered_keys.append(new_key)
     
-    # Set proper permissions
-    run_command(f'chmod 600 {authorized_keys_path}')
-    run_command(f'chown {os.getenv("USER", "splunk")}:{os.getenv("USER", "splunk")} {authorized_keys_path}')
+    # Write updated authorized_keys with proper permissions and ownership
+    payload = ('\n'.join(filtered_keys) + '\n').encode()
+    _write_private(authorized_keys_path, payload, chown=True)
     
     logger.info("Authorized_keys file updated successfully")
-    return True
+    return new_key
 
 
-def update_ssh_config():
+def update_ssh_config(key_type='rsa'):
     """Update SSH client configuration"""
     logger.info("Updating SSH client configuration...")
     
-    ssh_config_path = Path.home() / '.ssh' / 'config'
+    ssh_config_path = SSH_CONFIG
     
-    # Create SSH config if it doesn't exist
-    if not ssh_config_path.exists():
+    # Read existing config; it is created on write if it doesn't exist
+    try:
+        config = ssh_config_path.read_text()
+    except FileNotFoundError:
         ssh_config_path.parent.mkdir(exist_ok=True)
-        ssh_config_path.touch()
-    
-    # Read existing config
-    config_lines = []
-    if ssh_config_path.exists():
-        with open(ssh_config_path, 'r') as f:
-            config_lines = f.readlines()
+        config = ''
     
     # Update or add IdentityFile directive
-    updated = False
-    for i, line in enumerate(config_lines):
-        if line.strip().startswith('IdentityFile'):
-            config_lines[i] = f'    IdentityFile ~/.ssh/id_rsa\n'
-            updated = True
-            break
+    directive = f'    IdentityFile ~/.ssh/id_{key_type}'
+    config, updated = _IDFILE_RE.subn(lambda _: directive, config, count=1)
     
     if not updated:
         # Add IdentityFile directive
-        config_lines.append('    IdentityFile ~/.ssh/id_rsa\n')
-    
-    # Write updated config
-    with open(ssh_config_path, 'w') as f:
-        f.writelines(config_lines)
+        if config and not config.endswith('\n'):
+            config += '\n'
+        config += directive + '\n'
     
-    # Set proper permissions
-    run_command(f'chmod 600 {ssh_config_path}')
+    # Write updated config with proper permissions
+    _write_private(ssh_config_path, config.encode())
     
     logger.info("SSH client configuration updated successfully")
     return True
@@ -186,22 +292,27 @@ def restart_ssh_service():
     """Restart SSH service to apply changes"""
     logger.info("Restarting SSH service...")
     
-    # Try different service management commands
+    # Try different service management commands, skipping launchers that
+    # are not installed on this host
     restart_commands = [
-        'systemctl restart sshd',
-        'systemctl restart ssh',
-        'service sshd restart',
-        'service ssh restart',
-        '/etc/init.d/ssh restart'
+        ('systemctl', ['restart', 'sshd']),
+        ('systemctl', ['restart', 'ssh']),
+        ('service', ['sshd', 'restart']),
+        ('service', ['ssh', 'restart']),
+        ('/etc/init.d/ssh', ['restart']),
     ]
+    launchers = {launcher: shutil.which(launcher) for launcher, _ in restart_commands}
     
-    for cmd in restart_commands:
-        result = run_command(cmd)
+    for launcher, args in restart_commands:
+        executable = launchers[launcher]
+        if executable is None:
+            continue
+        result = run_command([executable] + args)
         if result['exit_code'] == 0:
             logger.info("SSH service restarted successfully")
             return True
         else:
-            logger.debug(f"Command failed: {cmd} - {result['stderr']}")
+            logger.debug("Command failed: %s %s - %s", launcher, ' '.join(args), result['stderr'])
     
     logger.warning("Could not restart SSH service - manual restart may be required")
     return False
@@ -218,28 +329,30 @@ def test_ssh_connectivity():
         logger.info("SSH connectivity test successful")
         return True
     else:
-        logger.error(f"SSH connectivity test failed: {result['stderr']}")
+        logger.error("SSH connectivity test failed: %s", result['stderr'])
         return False
 
 
 def cleanup_old_keys(backup_dir, retention_days=30):
     """Clean up old backup keys"""
-    logger.info(f"Cleaning up old backup keys (older than {retention_days} days)...")
-    
-    backup_path = Path(backup_dir)
-    if not backup_path.exists():
-        return True
+    logger.info("Cleaning up old backup keys (older than %d days)...", retention_days)
     
     # Find old backup files
-    cutoff_time = datetime.now().timestamp() - (retention_days * 24 * 60 * 60)
+    cutoff_time = time.time() - (retention_days * 24 * 60 * 60)
+    
+    try:
+        entries = os.scandir(backup_dir)
+    except FileNotFoundError:
+        return True
     
-    for file_path in backup_path.glob('*'):
-        if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-            try:
-                file_path.unlink()
-                logger.info(f"Removed old backup: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to remove old backup {file_path}: {e}")
+    with entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff_time:
+                try:
+                    os.unlink(entry.path)
+                    logger.info("Removed old backup: %s", entry.path)
+                except Exception as e:
+                    logger.warning("Failed to remove old backup %s: %s", entry.path, e)
     
     return True
 
@@ -265,10 +378,10 @@ def main():
     args = parser.parse_args()
     
     logger.info("Starting SSH key rotation...")
-    logger.info(f"Key type: {args.key_type}")
-    logger.info(f"Key size: {args.key_size}")
-    logger.info(f"Backup directory: {args.backup_dir}")
-    logger.info(f"Retention days: {args.retention_days}")
+    logger.info("Key type: %s", args.key_type)
+    logger.info("Key size: %s", args.key_size)
+    logger.info("Backup directory: %s", args.backup_dir)
+    logger.info("Retention days: %s", args.retention_days)
     
     if args.dry_run:
         logger.info("DRY RUN MODE - No changes will be made")
@@ -286,13 +399,14 @@ def main():
             return 1
         
         # Step 3: Update authorized_keys
-        public_key_path = Path.home() / '.ssh' / f'id_{args.key_type}.pub'
-        if not update_authorized_keys(public_key_path):
+        _, public_key_path = _key_paths(args.key_type)
+        new_public_key = update_authorized_keys(public_key_path)
+        if not new_public_key:
             logger.error("Failed to update authorized_keys")
             return 1
         
         # Step 4: Update SSH config
-        if not update_ssh_config():
+        if not update_ssh_config(args.key_type):
             logger.error("Failed to update SSH config")
             return 1
         
@@ -313,9 +427,6 @@ def main():
         logger.info("SSH key rotation completed successfully")
         
         # Output new public key for reference
-        with open(public_key_path, 'r') as f:
-            new_public_key = f.read().strip()
-        
         print("\n" + "="*60)
         print("NEW PUBLIC KEY (for reference):")
         print("="*60)
@@ -325,7 +436,7 @@ def main():
         return 0
         
     except Exception as e:
-        logger.error(f"Unexpected error during key rotation: {e}")
+        logger.error("Unexpected error during key rotation: %s", e)
         return 1
 
 
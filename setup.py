@@ -2,17 +2,33 @@
 Siemply - Splunk Infrastructure Orchestration Framework
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 # Read the README file
 this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text()
 
+# Packages under src/ (kept explicit to avoid walking the tree on every build)
+packages = [
+    "siemply",
+    "siemply.api",
+    "siemply.api.routes",
+    "siemply.cli",
+    "siemply.core",
+    "siemply.database",
+    "siemply.playbooks",
+    "siemply.ssh",
+    "siemply.tasks",
+    "siemply.utils",
+]
+
 # Read requirements
-requirements = []
-with open("requirements.txt", "r") as f:
-    requirements = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+requirements = [
+    stripped
+    for line in (this_directory / "requirements.txt").read_text().splitlines()
+    if (stripped := line.strip()) and not stripped.startswith("#")
+]
 
 setup(
     name="siemply",
@@ -23,7 +39,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/siemply/siemply",
-    packages=find_packages(where="src"),
+    packages=packages,
     package_dir={"": "src"},
     classifiers=[
         "Development Status :: 4 - Beta",
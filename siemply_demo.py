@@ -5,21 +5,81 @@ This is a standalone demo that doesn't require the full package installation
 """
 
 import asyncio
-import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Tuple
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+    
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=lambda o: o.isoformat()).encode('utf-8')
+
+# Seconds of real time slept per simulated second of upgrade work
+SIM_SPEED = float(os.getenv('SIEMPLY_DEMO_SIM_SPEED', '0.05'))
+
+
+# Simulated check and upgrade step results, shared read-only across hosts
+_CHECK_RESULTS = MappingProxyType({
+    **{check_type: {'status': 'PASS', 'output': f'{check_type} check passed'}
+       for check_type in ('disk_space', 'memory', 'ulimits', 'python', 'service_status',
+                          'version_check', 'port_check', 'health_check', 'connectivity_check')},
+    'selinux': {'status': 'WARN', 'output': 'SELinux in permissive mode'},
+})
+_STEP_RESULTS = MappingProxyType({
+    'stop_service': {'status': 'success', 'duration': 2.5, 'output': 'Splunk service stopped successfully'},
+    'backup_config': {'status': 'success', 'duration': 5.0, 'output': 'Configuration backed up successfully'},
+    'download_package': {'status': 'success', 'duration': 15.0, 'output': 'Package downloaded: splunkforwarder-{target_version}.rpm'},
+    'install_package': {'status': 'success', 'duration': 8.0, 'output': 'Package installed successfully'},
+    'restore_config': {'status': 'success', 'duration': 3.0, 'output': 'Configuration restored successfully'},
+    'start_service': {'status': 'success', 'duration': 4.0, 'output': 'Splunk service started successfully'},
+    'verify_version': {'status': 'success', 'duration': 1.0, 'output': 'Version verified: {target_version}'},
+})
+_VERSIONED_STEPS = frozenset({'download_package', 'verify_version'})
+
+# Report emoji for final host statuses; anything else is shown as pending
+STATUS_EMOJI = {'completed': "✅", 'failed': "❌"}
+
+# Per-host columns; stage statuses stay None until that phase has run
+_HOST_COLUMNS = ('name', 'ip', 'splunk_type', 'version', 'status',
+                 'precheck_status', 'upgrade_status', 'postcheck_status')
+_STAGE_COLUMNS = ('precheck_status', 'upgrade_status', 'postcheck_status')
+
+# Fixed report sections
+_HOST_RESULTS_HEADER = "## Host Results\n\n"
+_NEXT_STEPS = """## Next Steps
+
+1. Review the results above
+2. Check individual host statuses
+3. Address any failed checks or upgrades
+4. Run additional validation if needed
+"""
 
 
 class SiemplyDemo:
     """Siemply Demo - Simplified demonstration"""
     
-    def __init__(self):
+    def __init__(self, sim_speed: float = SIM_SPEED):
         self.logger = logging.getLogger(__name__)
+        self.sim_speed = sim_speed
         
         # Demo results
         self.results = {
@@ -31,6 +91,22 @@ class SiemplyDemo:
             'errors': [],
             'warnings': []
         }
+        
+        # Host names in inventory order, set once by the inventory phase
+        self._host_names: Tuple[str, ...] = ()
+        
+        # Host state as parallel column lists indexed like _host_names
+        self._hosts: Dict[str, List[Any]] = {column: [] for column in _HOST_COLUMNS}
+    
+    @property
+    def hosts_view(self) -> Dict[str, Dict[str, Any]]:
+        """Host state in the nested {name: {field: value}} shape"""
+        view = {}
+        for name, ip, splunk_type, version, status, *stages in zip(*self._hosts.values()):
+            host = {'ip': ip, 'splunk_type': splunk_type, 'version': version, 'status': status}
+            host.update((column, value) for column, value in zip(_STAGE_COLUMNS, stages) if value is not None)
+            view[name] = host
+        return view
     
     async def run_demo(self, target_group: str = "prod-web", target_version: str = "9.2.2"):
         """Run the complete demo workflow"""
@@ -38,8 +114,8 @@ class SiemplyDemo:
         
         try:
             self.logger.info("🚀 Starting Siemply Demo")
-            self.logger.info(f"Target Group: {target_group}")
-            self.logger.info(f"Target Version: {target_version}")
+            self.logger.info("Target Group: %s", target_group)
+            self.logger.info("Target Version: %s", target_version)
             
             # Phase 1: Load and validate inventory
             await self._phase_inventory_load(target_group)
@@ -59,17 +135,22 @@ class SiemplyDemo:
             self.results['end_time'] = datetime.now()
             self.results['duration'] = (self.results['end_time'] - self.results['start_time']).total_seconds()
             
+            await self._write_results_json()
+            
             self.logger.info("✅ Siemply Demo completed successfully")
             
         except Exception as e:
-            self.logger.error(f"❌ Siemply Demo failed: {e}")
+            self.logger.error("❌ Siemply Demo failed: %s", e)
             self.results['errors'].append(str(e))
             raise
+        finally:
+            # Publish host state even when a phase failed part-way
+            self.results['hosts'] = self.hosts_view
     
     async def _phase_inventory_load(self, target_group: str):
         """Phase 1: Load and validate inventory"""
         phase_name = "inventory_load"
-        self.logger.info(f"📋 Phase 1: Loading inventory for group '{target_group}'")
+        self.logger.info("📋 Phase 1: Loading inventory for group '%s'", target_group)
         
         try:
             # Simulate inventory loading
@@ -85,57 +166,40 @@ class SiemplyDemo:
                 'hosts': [h['name'] for h in hosts]
             }
             
-            self.logger.info(f"✅ Found {len(hosts)} hosts in group '{target_group}'")
+            self.logger.info("✅ Found %s hosts in group '%s'", len(hosts), target_group)
             
             # Store hosts for later phases
-            self.results['hosts'] = {h['name']: {
-                'ip': h['ip'],
-                'splunk_type': h['splunk_type'],
-                'version': h['version'],
-                'status': 'pending'
-            } for h in hosts}
+            self._host_names = tuple(h['name'] for h in hosts)
+            self._hosts = {
+                'name': list(self._host_names),
+                'ip': [h['ip'] for h in hosts],
+                'splunk_type': [h['splunk_type'] for h in hosts],
+                'version': [h['version'] for h in hosts],
+                'status': ['pending'] * len(hosts),
+                **{column: [None] * len(hosts) for column in _STAGE_COLUMNS}
+            }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 1 failed: {e}")
+            self.logger.error("❌ Phase 1 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
     async def _phase_prechecks(self, target_group: str):
         """Phase 2: Pre-upgrade system checks"""
         phase_name = "prechecks"
-        self.logger.info(f"🔍 Phase 2: Running pre-upgrade checks")
+        self.logger.info("🔍 Phase 2: Running pre-upgrade checks")
         
         try:
-            precheck_results = {}
+            sem = asyncio.Semaphore(10)  # Hosts checked concurrently
+            check_types = ['disk_space', 'memory', 'ulimits', 'selinux', 'ports', 'python']
             
-            for host_name, host_data in self.results['hosts'].items():
-                self.logger.info(f"  Checking {host_name} ({host_data['ip']})...")
-                
-                # Simulate prechecks
-                host_checks = {
-                    'disk_space': self._simulate_check('disk_space'),
-                    'memory': self._simulate_check('memory'),
-                    'ulimits': self._simulate_check('ulimits'),
-                    'selinux': self._simulate_check('selinux'),
-                    'ports': self._simulate_check('ports'),
-                    'python': self._simulate_check('python')
-                }
-                
-                # Determine overall status
-                all_passed = all(check['status'] == 'PASS' for check in host_checks.values())
-                host_status = 'PASS' if all_passed else 'FAIL'
-                
-                precheck_results[host_name] = {
-                    'status': host_status,
-                    'checks': host_checks
-                }
-                
-                self.results['hosts'][host_name]['precheck_status'] = host_status
-                
-                if host_status == 'PASS':
-                    self.logger.info(f"    ✅ {host_name} - All prechecks passed")
-                else:
-                    self.logger.warning(f"    ⚠️ {host_name} - Some prechecks failed")
+            results = await asyncio.gather(*[
+                self._check_host(host_name, ip, check_types, 'precheck', sem)
+                for host_name, ip in zip(self._host_names, self._hosts['ip'])
+            ])
+            
+            precheck_results = dict(zip(self._host_names, results))
+            self._hosts['precheck_status'] = [result['status'] for result in results]
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -143,92 +207,26 @@ class SiemplyDemo:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 2 failed: {e}")
+            self.logger.error("❌ Phase 2 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
     async def _phase_rolling_upgrade(self, target_group: str, target_version: str):
         """Phase 3: Rolling UF upgrade simulation"""
         phase_name = "rolling_upgrade"
-        self.logger.info(f"🔄 Phase 3: Rolling UF upgrade to version {target_version}")
+        self.logger.info("🔄 Phase 3: Rolling UF upgrade to version %s", target_version)
         
         try:
-            hosts = list(self.results['hosts'].keys())
-            batch_size = 2  # Simulate small batches
-            batch_delay = 2  # 2 seconds between batches
+            batch_size = 2  # At most 2 hosts upgrading at once
+            sem = asyncio.Semaphore(batch_size)
             
-            upgrade_results = {}
+            results = await asyncio.gather(*[
+                self._upgrade_host(host_name, ip, target_version, sem)
+                for host_name, ip in zip(self._host_names, self._hosts['ip'])
+            ])
             
-            # Process hosts in batches
-            for i in range(0, len(hosts), batch_size):
-                batch = hosts[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                
-                self.logger.info(f"  Processing batch {batch_num}: {len(batch)} hosts")
-                
-                # Process batch
-                for host_name in batch:
-                    host_data = self.results['hosts'][host_name]
-                    self.logger.info(f"    Upgrading {host_name} ({host_data['ip']})...")
-                    
-                    # Simulate upgrade steps
-                    upgrade_steps = [
-                        ('stop_service', 'Stopping Splunk service'),
-                        ('backup_config', 'Backing up configuration'),
-                        ('download_package', f'Downloading UF {target_version}'),
-                        ('install_package', 'Installing new version'),
-                        ('restore_config', 'Restoring configuration'),
-                        ('start_service', 'Starting Splunk service'),
-                        ('verify_version', 'Verifying version')
-                    ]
-                    
-                    host_upgrade = {
-                        'status': 'success',
-                        'steps': {},
-                        'start_time': datetime.now().isoformat(),
-                        'end_time': None,
-                        'duration': 0
-                    }
-                    
-                    step_start = time.time()
-                    
-                    for step_name, step_desc in upgrade_steps:
-                        self.logger.info(f"      {step_desc}...")
-                        
-                        # Simulate step execution
-                        step_result = self._simulate_upgrade_step(step_name, target_version)
-                        
-                        host_upgrade['steps'][step_name] = {
-                            'description': step_desc,
-                            'status': step_result['status'],
-                            'duration': step_result['duration'],
-                            'output': step_result['output']
-                        }
-                        
-                        if step_result['status'] == 'failed':
-                            host_upgrade['status'] = 'failed'
-                            host_upgrade['error'] = step_result['error']
-                            break
-                        
-                        # Simulate step duration
-                        await asyncio.sleep(0.3)
-                    
-                    step_end = time.time()
-                    host_upgrade['end_time'] = datetime.now().isoformat()
-                    host_upgrade['duration'] = step_end - step_start
-                    
-                    upgrade_results[host_name] = host_upgrade
-                    self.results['hosts'][host_name]['upgrade_status'] = host_upgrade['status']
-                    
-                    if host_upgrade['status'] == 'success':
-                        self.logger.info(f"    ✅ {host_name} - Upgrade completed successfully")
-                    else:
-                        self.logger.error(f"    ❌ {host_name} - Upgrade failed: {host_upgrade.get('error', 'Unknown error')}")
-                
-                # Wait between batches (except for last batch)
-                if i + batch_size < len(hosts):
-                    self.logger.info(f"  Waiting {batch_delay} seconds before next batch...")
-                    await asyncio.sleep(batch_delay)
+            upgrade_results = dict(zip(self._host_names, results))
+            self._hosts['upgrade_status'] = [host_upgrade['status'] for host_upgrade in results]
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -236,46 +234,29 @@ class SiemplyDemo:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 3 failed: {e}")
+            self.logger.error("❌ Phase 3 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
     async def _phase_postchecks(self, target_group: str):
         """Phase 4: Post-upgrade validation"""
         phase_name = "postchecks"
-        self.logger.info(f"✅ Phase 4: Running post-upgrade validation")
+        self.logger.info("✅ Phase 4: Running post-upgrade validation")
         
         try:
-            postcheck_results = {}
-            
-            for host_name, host_data in self.results['hosts'].items():
-                self.logger.info(f"  Validating {host_name} ({host_data['ip']})...")
-                
-                # Simulate postchecks
-                host_checks = {
-                    'service_status': self._simulate_check('service_status'),
-                    'version_check': self._simulate_check('version_check'),
-                    'port_check': self._simulate_check('port_check'),
-                    'health_check': self._simulate_check('health_check'),
-                    'connectivity_check': self._simulate_check('connectivity_check')
-                }
-                
-                # Determine overall status
-                all_passed = all(check['status'] == 'PASS' for check in host_checks.values())
-                host_status = 'PASS' if all_passed else 'FAIL'
-                
-                postcheck_results[host_name] = {
-                    'status': host_status,
-                    'checks': host_checks
-                }
-                
-                self.results['hosts'][host_name]['postcheck_status'] = host_status
-                self.results['hosts'][host_name]['status'] = 'completed' if host_status == 'PASS' else 'failed'
-                
-                if host_status == 'PASS':
-                    self.logger.info(f"    ✅ {host_name} - All postchecks passed")
-                else:
-                    self.logger.warning(f"    ⚠️ {host_name} - Some postchecks failed")
+            sem = asyncio.Semaphore(10)  # Hosts validated concurrently
+            check_types = ['service_status', 'version_check', 'port_check', 'health_check', 'connectivity_check']
+            
+            results = await asyncio.gather(*[
+                self._check_host(host_name, ip, check_types, 'postcheck', sem)
+                for host_name, ip in zip(self._host_names, self._hosts['ip'])
+            ])
+            
+            postcheck_results = dict(zip(self._host_names, results))
+            self._hosts['postcheck_status'] = [result['status'] for result in results]
+            self._hosts['status'] = [
+                'completed' if result['status'] == 'PASS' else 'failed' for result in results
+            ]
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -283,164 +264,270 @@ class SiemplyDemo:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 4 failed: {e}")
+            self.logger.error("❌ Phase 4 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
+    async def _check_host(self, host_name: str, ip: str, check_types: List[str], kind: str,
+                          sem: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run a set of simulated checks against a single host"""
+        async with sem:
+            verb = 'Checking' if kind == 'precheck' else 'Validating'
+            self.logger.info("  %s %s (%s)...", verb, host_name, ip)
+            
+            # Simulate checks
+            host_checks = {check_type: self._simulate_check(check_type) for check_type in check_types}
+            
+            # Determine overall status; all() stops at the first non-passing check
+            host_status = 'PASS' if all(
+                check['status'] == 'PASS' for check in host_checks.values()
+            ) else 'FAIL'
+            
+            if host_status == 'PASS':
+                self.logger.info("    ✅ %s - All %ss passed", host_name, kind)
+            else:
+                self.logger.warning("    ⚠️ %s - Some %ss failed", host_name, kind)
+            
+            return {
+                'status': host_status,
+                'checks': host_checks
+            }
+    
+    async def _upgrade_host(self, host_name: str, ip: str, target_version: str,
+                            sem: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run the simulated upgrade steps on a single host"""
+        async with sem:
+            self.logger.info("    Upgrading %s (%s)...", host_name, ip)
+            
+            # Simulate upgrade steps
+            upgrade_steps = [
+                ('stop_service', 'Stopping Splunk service'),
+                ('backup_config', 'Backing up configuration'),
+                ('download_package', f'Downloading UF {target_version}'),
+                ('install_package', 'Installing new version'),
+                ('restore_config', 'Restoring configuration'),
+                ('start_service', 'Starting Splunk service'),
+                ('verify_version', 'Verifying version')
+            ]
+            
+            t0 = time.monotonic()
+            host_upgrade = {
+                'status': 'success',
+                'steps': {},
+                'start_time': datetime.now(),
+                'end_time': None,
+                'duration': 0
+            }
+            
+            steps_buf = [None] * len(upgrade_steps)
+            
+            for idx, (step_name, step_desc) in enumerate(upgrade_steps):
+                self.logger.info("      %s...", step_desc)
+                
+                # Simulate step execution
+                step_result = self._simulate_upgrade_step(step_name, target_version)
+                
+                steps_buf[idx] = (step_name, {
+                    'description': step_desc,
+                    'status': step_result['status'],
+                    'duration': step_result['duration'],
+                    'output': step_result['output']
+                })
+                
+                if step_result['status'] == 'failed':
+                    host_upgrade['status'] = 'failed'
+                    host_upgrade['error'] = step_result['error']
+                    break
+            
+            # Simulate the combined duration of the executed steps
+            if self.sim_speed > 0:
+                simulated = sum(step[1]['duration'] for step in steps_buf if step is not None)
+                await asyncio.sleep(self.sim_speed * simulated)
+            
+            host_upgrade['steps'] = dict(step for step in steps_buf if step is not None)
+            host_upgrade['duration'] = time.monotonic() - t0
+            host_upgrade['end_time'] = datetime.now()
+            
+            if host_upgrade['status'] == 'success':
+                self.logger.info("    ✅ %s - Upgrade completed successfully", host_name)
+            else:
+                self.logger.error("    ❌ %s - Upgrade failed: %s", host_name, host_upgrade.get('error', 'Unknown error'))
+            
+            return host_upgrade
+    
     async def _phase_generate_report(self):
         """Phase 5: Generate Markdown report"""
         phase_name = "generate_report"
-        self.logger.info(f"📊 Phase 5: Generating Markdown report")
+        self.logger.info("📊 Phase 5: Generating Markdown report")
         
         try:
             # Create reports directory
             reports_dir = Path("reports")
-            reports_dir.mkdir(exist_ok=True)
+            await asyncio.to_thread(reports_dir.mkdir, exist_ok=True)
+            
+            # Publish host state in the nested shape for the reports and callers
+            self.results['hosts'] = self.hosts_view
             
             # Generate report
             report_content = self._generate_markdown_report()
             
             # Save report
-            report_file = reports_dir / f"siemply_demo_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            report_file.write_text(report_content)
+            report_stem = f"siemply_demo_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            report_file = reports_dir / f"{report_stem}.md"
+            await self._write_bytes(report_file, report_content.encode('utf-8'))
+            
+            # Machine-readable results go alongside the Markdown report; run_demo
+            # writes them once the final timing is known
+            json_file = reports_dir / f"{report_stem}.json"
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
-                'report_file': str(report_file)
+                'report_file': str(report_file),
+                'json_file': str(json_file)
             }
             
-            self.logger.info(f"✅ Report generated: {report_file}")
+            self.logger.info("✅ Report generated: %s", report_file)
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 5 failed: {e}")
+            self.logger.error("❌ Phase 5 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
-    def _simulate_check(self, check_type: str) -> Dict[str, Any]:
-        """Simulate a health check"""
-        # Simulate different check results based on check type
-        if check_type in ['disk_space', 'memory', 'ulimits', 'python', 'service_status', 'version_check', 'port_check', 'health_check', 'connectivity_check']:
-            return {'status': 'PASS', 'output': f'{check_type} check passed'}
-        elif check_type == 'selinux':
-            return {'status': 'WARN', 'output': 'SELinux in permissive mode'}
+    async def _write_results_json(self):
+        """Save the results dict to the JSON file named by the report phase"""
+        json_file = Path(self.results['phases']['generate_report']['json_file'])
+        await self._write_bytes(json_file, _dumps(self.results))
+        self.logger.info("✅ Results saved: %s", json_file)
+    
+    async def _write_bytes(self, path: Path, data: bytes):
+        """Write pre-encoded data in one call, without the text codec layer"""
+        if aiofiles is not None:
+            async with aiofiles.open(path, 'wb') as f:
+                await f.write(data)
         else:
+            await asyncio.to_thread(path.write_bytes, data)
+    
+    def _simulate_check(self, check_type: str) -> Dict[str, Any]:
+        """Simulate a health check (the returned dict is shared; do not mutate it)"""
+        result = _CHECK_RESULTS.get(check_type)
+        if result is None:
             return {'status': 'PASS', 'output': f'{check_type} check completed'}
+        return result
     
     def _simulate_upgrade_step(self, step_name: str, target_version: str) -> Dict[str, Any]:
-        """Simulate an upgrade step"""
-        # Simulate different step results
-        if step_name == 'stop_service':
-            return {'status': 'success', 'duration': 2.5, 'output': 'Splunk service stopped successfully'}
-        elif step_name == 'backup_config':
-            return {'status': 'success', 'duration': 5.0, 'output': 'Configuration backed up successfully'}
-        elif step_name == 'download_package':
-            return {'status': 'success', 'duration': 15.0, 'output': f'Package downloaded: splunkforwarder-{target_version}.rpm'}
-        elif step_name == 'install_package':
-            return {'status': 'success', 'duration': 8.0, 'output': 'Package installed successfully'}
-        elif step_name == 'restore_config':
-            return {'status': 'success', 'duration': 3.0, 'output': 'Configuration restored successfully'}
-        elif step_name == 'start_service':
-            return {'status': 'success', 'duration': 4.0, 'output': 'Splunk service started successfully'}
-        elif step_name == 'verify_version':
-            return {'status': 'success', 'duration': 1.0, 'output': f'Version verified: {target_version}'}
-        else:
+        """Simulate an upgrade step (the returned dict is shared; do not mutate it)"""
+        result = _STEP_RESULTS.get(step_name)
+        if result is None:
             return {'status': 'success', 'duration': 1.0, 'output': f'{step_name} completed successfully'}
+        if step_name in _VERSIONED_STEPS:
+            return {**result, 'output': result['output'].format(target_version=target_version)}
+        return result
     
     def _generate_markdown_report(self) -> str:
         """Generate Markdown report"""
-        report = f"""# Siemply Demo Report
+        now_iso = datetime.now().isoformat()
+        status_counts = Counter(self._hosts['status'])
+        parts = [f"""# Siemply Demo Report
 
-**Generated:** {datetime.now().isoformat()}  
+**Generated:** {now_iso}  
 **Duration:** {self.results['duration']:.2f} seconds  
 **Status:** {'SUCCESS' if not self.results['errors'] else 'FAILED'}
 
 ## Summary
 
 - **Total Phases:** {len(self.results['phases'])}
-- **Total Hosts:** {len(self.results['hosts'])}
-- **Successful Hosts:** {sum(1 for h in self.results['hosts'].values() if h.get('status') == 'completed')}
-- **Failed Hosts:** {sum(1 for h in self.results['hosts'].values() if h.get('status') == 'failed')}
+- **Total Hosts:** {len(self._host_names)}
+- **Successful Hosts:** {status_counts['completed']}
+- **Failed Hosts:** {status_counts['failed']}
 
 ## Phase Results
 
-"""
+"""]
         
         for phase_name, phase_data in self.results['phases'].items():
             status_emoji = "✅" if phase_data['status'] == 'success' else "❌"
-            report += f"### {status_emoji} {phase_name.replace('_', ' ').title()}\n\n"
-            report += f"**Status:** {phase_data['status'].upper()}\n"
+            parts.append(f"### {status_emoji} {phase_name.replace('_', ' ').title()}\n\n")
+            parts.append(f"**Status:** {phase_data['status'].upper()}\n")
             
             if 'error' in phase_data:
-                report += f"**Error:** {phase_data['error']}\n"
+                parts.append(f"**Error:** {phase_data['error']}\n")
             
             if 'hosts_found' in phase_data:
-                report += f"**Hosts Found:** {phase_data['hosts_found']}\n"
+                parts.append(f"**Hosts Found:** {phase_data['hosts_found']}\n")
             
-            report += "\n"
+            parts.append("\n")
         
-        report += "## Host Results\n\n"
+        parts.append(_HOST_RESULTS_HEADER)
         
-        for host_name, host_data in self.results['hosts'].items():
-            status_emoji = "✅" if host_data.get('status') == 'completed' else "❌" if host_data.get('status') == 'failed' else "⏳"
-            report += f"### {status_emoji} {host_name}\n\n"
-            report += f"**IP:** {host_data['ip']}\n"
-            report += f"**Splunk Type:** {host_data['splunk_type']}\n"
-            report += f"**Version:** {host_data['version']}\n"
-            report += f"**Status:** {host_data.get('status', 'unknown')}\n"
+        for (host_name, ip, splunk_type, version, status,
+             precheck_status, upgrade_status, postcheck_status) in zip(*self._hosts.values()):
+            status_emoji = STATUS_EMOJI.get(status, "⏳")
+            parts.append(f"### {status_emoji} {host_name}\n\n")
+            parts.append(f"**IP:** {ip}\n")
+            parts.append(f"**Splunk Type:** {splunk_type}\n")
+            parts.append(f"**Version:** {version}\n")
+            parts.append(f"**Status:** {status or 'unknown'}\n")
             
-            if 'precheck_status' in host_data:
-                report += f"**Precheck Status:** {host_data['precheck_status']}\n"
+            if precheck_status is not None:
+                parts.append(f"**Precheck Status:** {precheck_status}\n")
             
-            if 'upgrade_status' in host_data:
-                report += f"**Upgrade Status:** {host_data['upgrade_status']}\n"
+            if upgrade_status is not None:
+                parts.append(f"**Upgrade Status:** {upgrade_status}\n")
             
-            if 'postcheck_status' in host_data:
-                report += f"**Postcheck Status:** {host_data['postcheck_status']}\n"
+            if postcheck_status is not None:
+                parts.append(f"**Postcheck Status:** {postcheck_status}\n")
             
-            report += "\n"
+            parts.append("\n")
         
         if self.results['errors']:
-            report += "## Errors\n\n"
+            parts.append("## Errors\n\n")
             for error in self.results['errors']:
-                report += f"- {error}\n"
-            report += "\n"
+                parts.append(f"- {error}\n")
+            parts.append("\n")
         
         if self.results['warnings']:
-            report += "## Warnings\n\n"
+            parts.append("## Warnings\n\n")
             for warning in self.results['warnings']:
-                report += f"- {warning}\n"
-            report += "\n"
+                parts.append(f"- {warning}\n")
+            parts.append("\n")
         
-        report += "## Next Steps\n\n"
-        report += "1. Review the results above\n"
-        report += "2. Check individual host statuses\n"
-        report += "3. Address any failed checks or upgrades\n"
-        report += "4. Run additional validation if needed\n"
+        parts.append(_NEXT_STEPS)
         
-        return report
+        return "".join(parts)
 
 
 async def main():
     """Main function"""
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    # Configure logging; records are queued and written to stderr by a
+    # background listener thread so the event loop never blocks on output
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
     
     # Parse command line arguments
     import argparse
     parser = argparse.ArgumentParser(description='Siemply Demo')
     parser.add_argument('--group', '-g', default='prod-web', help='Target group')
     parser.add_argument('--version', '-v', default='9.2.2', help='Target version')
+    parser.add_argument('--no-sleep', action='store_true',
+                        help='Skip simulated step durations (useful for benchmarking)')
     
     args = parser.parse_args()
     
     # Create and run demo
-    demo = SiemplyDemo()
+    demo = SiemplyDemo(sim_speed=0 if args.no_sleep else SIM_SPEED)
     
     try:
-        await demo.run_demo(args.group, args.version)
+        try:
+            await demo.run_demo(args.group, args.version)
+        finally:
+            # Drain queued log records before printing the summary
+            listener.stop()
         print("\n🎉 Siemply Demo completed successfully!")
         print(f"📊 Check the reports/ directory for detailed results")
     except Exception as e:
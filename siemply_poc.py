@@ -5,14 +5,14 @@ Demonstrates: inventory load → prechecks → rolling UF upgrade → postchecks
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
 import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -31,14 +31,55 @@ except ImportError:
     from src.siemply.core.secrets import SecretsManager
     from src.siemply.core.audit import AuditLogger
 
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    import json
+    
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2, default=str)
+
+
+# Report emoji for final host statuses; anything else is shown as pending
+STATUS_EMOJI = {'completed': "✅", 'failed': "❌", 'skipped': "⏭️"}
+
+# Check statuses that do not fail a host
+_OK_STATUSES = frozenset({'PASS', 'WARN'})
+
+# Checks run before and after the upgrade
+_PRECHECKS = ('disk_space', 'memory', 'ulimits', 'selinux', 'ports', 'python')
+_POSTCHECKS = ('service_status', 'version_check', 'port_check', 'health_check', 'connectivity_check')
+
+# Upgrade pipeline steps; descriptions are formatted with the target version
+_UPGRADE_STEPS = (
+    ('stop_service', 'Stopping Splunk service'),
+    ('backup_config', 'Backing up configuration'),
+    ('download_package', 'Downloading UF {version}'),
+    ('install_package', 'Installing new version'),
+    ('restore_config', 'Restoring configuration'),
+    ('start_service', 'Starting Splunk service'),
+    ('verify_version', 'Verifying version'),
+)
+
 
 class SiemplyPoC:
     """Siemply Proof of Concept"""
     
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = "config", max_concurrency: int = 8):
         self.config_dir = config_dir
         self.logger = logging.getLogger(__name__)
         
+        # Cap concurrent per-host work to stay under sshd MaxStartups
+        self._ssh_sem = asyncio.Semaphore(max_concurrency)
+        
         # Initialize components
         self.orchestrator = Orchestrator(config_dir)
         self.inventory = Inventory(config_dir)
@@ -61,9 +102,14 @@ class SiemplyPoC:
         """Initialize Siemply components"""
         try:
             await self.orchestrator.initialize()
+            
+            # Create reports directory
+            self.reports_dir = Path("reports")
+            self.reports_dir.mkdir(exist_ok=True)
+            
             self.logger.info("Siemply PoC initialized successfully")
         except Exception as e:
-            self.logger.error(f"Failed to initialize Siemply PoC: {e}")
+            self.logger.error("Failed to initialize Siemply PoC: %s", e)
             raise
     
     async def run_demo(self, target_group: str = "prod-web", target_version: str = "9.2.2"):
@@ -72,38 +118,42 @@ class SiemplyPoC:
         
         try:
             self.logger.info("🚀 Starting Siemply PoC Demo")
-            self.logger.info(f"Target Group: {target_group}")
-            self.logger.info(f"Target Version: {target_version}")
+            self.logger.info("Target Group: %s", target_group)
+            self.logger.info("Target Version: %s", target_version)
             
             # Phase 1: Load and validate inventory
-            await self._phase_inventory_load(target_group)
+            hosts = await self._phase_inventory_load(target_group)
             
             # Phase 2: Pre-upgrade checks
-            await self._phase_prechecks(target_group)
+            await self._phase_prechecks(hosts)
             
             # Phase 3: Rolling UF upgrade simulation
-            await self._phase_rolling_upgrade(target_group, target_version)
+            await self._phase_rolling_upgrade(hosts, target_version)
             
             # Phase 4: Post-upgrade validation
-            await self._phase_postchecks(target_group)
+            await self._phase_postchecks(hosts)
             
             # Phase 5: Generate report
             await self._phase_generate_report()
             
             self.results['end_time'] = datetime.now()
             self.results['duration'] = (self.results['end_time'] - self.results['start_time']).total_seconds()
+            await self._write_results_json()
             
             self.logger.info("✅ Siemply PoC Demo completed successfully")
             
         except Exception as e:
-            self.logger.error(f"❌ Siemply PoC Demo failed: {e}")
+            self.logger.error("❌ Siemply PoC Demo failed: %s", e)
             self.results['errors'].append(str(e))
             raise
+        finally:
+            # Release the per-host SSH connections cached by the executor for this run
+            await self.ssh_executor.close_all_connections()
     
-    async def _phase_inventory_load(self, target_group: str):
-        """Phase 1: Load and validate inventory"""
+    async def _phase_inventory_load(self, target_group: str) -> List[Any]:
+        """Phase 1: Load and validate inventory, returning the target hosts"""
         phase_name = "inventory_load"
-        self.logger.info(f"📋 Phase 1: Loading inventory for group '{target_group}'")
+        self.logger.info("📋 Phase 1: Loading inventory for group '%s'", target_group)
         
         try:
             # Load inventory
@@ -120,7 +170,7 @@ class SiemplyPoC:
                 'hosts': [h.name for h in hosts]
             }
             
-            self.logger.info(f"✅ Found {len(hosts)} hosts in group '{target_group}'")
+            self.logger.info("✅ Found %s hosts in group '%s'", len(hosts), target_group)
             
             # Store hosts for later phases
             self.results['hosts'] = {h.name: {
@@ -131,48 +181,34 @@ class SiemplyPoC:
                 'status': 'pending'
             } for h in hosts}
             
+            return hosts
+            
         except Exception as e:
-            self.logger.error(f"❌ Phase 1 failed: {e}")
+            self.logger.error("❌ Phase 1 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
-    async def _phase_prechecks(self, target_group: str):
+    async def _phase_prechecks(self, hosts: List[Any]):
         """Phase 2: Pre-upgrade system checks"""
         phase_name = "prechecks"
-        self.logger.info(f"🔍 Phase 2: Running pre-upgrade checks")
+        self.logger.info("🔍 Phase 2: Running pre-upgrade checks")
         
         try:
-            hosts = self.inventory.get_group_hosts(target_group)
             precheck_results = {}
             
-            for host in hosts:
-                self.logger.info(f"  Checking {host.name} ({host.ansible_host})...")
-                
-                # Simulate prechecks (in real implementation, these would be actual checks)
-                host_checks = {
-                    'disk_space': self._simulate_check('disk_space', host),
-                    'memory': self._simulate_check('memory', host),
-                    'ulimits': self._simulate_check('ulimits', host),
-                    'selinux': self._simulate_check('selinux', host),
-                    'ports': self._simulate_check('ports', host),
-                    'python': self._simulate_check('python', host)
-                }
-                
-                # Determine overall status
-                all_passed = all(check['status'] == 'PASS' for check in host_checks.values())
-                host_status = 'PASS' if all_passed else 'FAIL'
-                
-                precheck_results[host.name] = {
-                    'status': host_status,
-                    'checks': host_checks
-                }
-                
-                self.results['hosts'][host.name]['precheck_status'] = host_status
+            results = await asyncio.gather(
+                *(self._bounded(self._check_host(host, _PRECHECKS, 'precheck')) for host in hosts),
+                return_exceptions=True
+            )
+            
+            host_views = self.results['hosts']
+            for host, result in zip(hosts, results):
+                if isinstance(result, Exception):
+                    self.logger.error("    ❌ %s - Prechecks errored: %s", host.name, result)
+                    result = {'status': 'FAIL', 'checks': {}, 'error': str(result)}
                 
-                if host_status == 'PASS':
-                    self.logger.info(f"    ✅ {host.name} - All prechecks passed")
-                else:
-                    self.logger.warning(f"    ⚠️ {host.name} - Some prechecks failed")
+                precheck_results[host.name] = result
+                host_views[host.name]['precheck_status'] = result['status']
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -180,91 +216,54 @@ class SiemplyPoC:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 2 failed: {e}")
+            self.logger.error("❌ Phase 2 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
-    async def _phase_rolling_upgrade(self, target_group: str, target_version: str):
+    async def _phase_rolling_upgrade(self, hosts: List[Any], target_version: str):
         """Phase 3: Rolling UF upgrade simulation"""
         phase_name = "rolling_upgrade"
-        self.logger.info(f"🔄 Phase 3: Rolling UF upgrade to version {target_version}")
+        self.logger.info("🔄 Phase 3: Rolling UF upgrade to version %s", target_version)
         
         try:
-            hosts = self.inventory.get_group_hosts(target_group)
             batch_size = 2  # Simulate small batches
-            batch_delay = 5  # 5 seconds between batches
+            batch_delay = 5  # At least 5 seconds between batch starts
             
             upgrade_results = {}
+            host_views = self.results['hosts']
+            
+            # Skip hosts that failed prechecks
+            skipped = [h for h in hosts if host_views[h.name].get('precheck_status') != 'PASS']
+            if skipped:
+                for host in skipped:
+                    host_views[host.name]['upgrade_status'] = 'skipped'
+                    host_views[host.name]['status'] = 'skipped'
+                    self.logger.warning("    ⏭️ %s - Skipping upgrade, prechecks did not pass", host.name)
+                hosts = [h for h in hosts if host_views[h.name].get('precheck_status') == 'PASS']
+                self.logger.info("  Upgrading %d hosts, skipped %d", len(hosts), len(skipped))
             
             # Process hosts in batches
             for i in range(0, len(hosts), batch_size):
                 batch = hosts[i:i + batch_size]
                 batch_num = i // batch_size + 1
                 
-                self.logger.info(f"  Processing batch {batch_num}: {len(batch)} hosts")
+                self.logger.info("  Processing batch %s: %s hosts", batch_num, len(batch))
+                batch_t0 = time.monotonic()
                 
                 # Process batch
-                for host in batch:
-                    self.logger.info(f"    Upgrading {host.name} ({host.ansible_host})...")
-                    
-                    # Simulate upgrade steps
-                    upgrade_steps = [
-                        ('stop_service', 'Stopping Splunk service'),
-                        ('backup_config', 'Backing up configuration'),
-                        ('download_package', f'Downloading UF {target_version}'),
-                        ('install_package', 'Installing new version'),
-                        ('restore_config', 'Restoring configuration'),
-                        ('start_service', 'Starting Splunk service'),
-                        ('verify_version', 'Verifying version')
-                    ]
-                    
-                    host_upgrade = {
-                        'status': 'success',
-                        'steps': {},
-                        'start_time': datetime.now().isoformat(),
-                        'end_time': None,
-                        'duration': 0
-                    }
-                    
-                    step_start = time.time()
-                    
-                    for step_name, step_desc in upgrade_steps:
-                        self.logger.info(f"      {step_desc}...")
-                        
-                        # Simulate step execution
-                        step_result = self._simulate_upgrade_step(step_name, host, target_version)
-                        
-                        host_upgrade['steps'][step_name] = {
-                            'description': step_desc,
-                            'status': step_result['status'],
-                            'duration': step_result['duration'],
-                            'output': step_result['output']
-                        }
-                        
-                        if step_result['status'] == 'failed':
-                            host_upgrade['status'] = 'failed'
-                            host_upgrade['error'] = step_result['error']
-                            break
-                        
-                        # Simulate step duration
-                        await asyncio.sleep(0.5)
-                    
-                    step_end = time.time()
-                    host_upgrade['end_time'] = datetime.now().isoformat()
-                    host_upgrade['duration'] = step_end - step_start
-                    
+                batch_results = await asyncio.gather(
+                    *(self._bounded(self._upgrade_host(host, target_version)) for host in batch)
+                )
+                
+                for host, host_upgrade in zip(batch, batch_results):
                     upgrade_results[host.name] = host_upgrade
-                    self.results['hosts'][host.name]['upgrade_status'] = host_upgrade['status']
-                    
-                    if host_upgrade['status'] == 'success':
-                        self.logger.info(f"    ✅ {host.name} - Upgrade completed successfully")
-                    else:
-                        self.logger.error(f"    ❌ {host.name} - Upgrade failed: {host_upgrade.get('error', 'Unknown error')}")
+                    host_views[host.name]['upgrade_status'] = host_upgrade['status']
                 
-                # Wait between batches (except for last batch)
-                if i + batch_size < len(hosts):
-                    self.logger.info(f"  Waiting {batch_delay} seconds before next batch...")
-                    await asyncio.sleep(batch_delay)
+                # Wait out the rest of the batch interval (except for last batch)
+                remaining = batch_delay - (time.monotonic() - batch_t0)
+                if remaining > 0 and i + batch_size < len(hosts):
+                    self.logger.info("  Waiting %.1f seconds before next batch...", remaining)
+                    await asyncio.sleep(remaining)
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -272,47 +271,37 @@ class SiemplyPoC:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 3 failed: {e}")
+            self.logger.error("❌ Phase 3 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
-    async def _phase_postchecks(self, target_group: str):
+    async def _phase_postchecks(self, hosts: List[Any]):
         """Phase 4: Post-upgrade validation"""
         phase_name = "postchecks"
-        self.logger.info(f"✅ Phase 4: Running post-upgrade validation")
+        self.logger.info("✅ Phase 4: Running post-upgrade validation")
         
         try:
-            hosts = self.inventory.get_group_hosts(target_group)
             postcheck_results = {}
+            host_views = self.results['hosts']
             
-            for host in hosts:
-                self.logger.info(f"  Validating {host.name} ({host.ansible_host})...")
-                
-                # Simulate postchecks
-                host_checks = {
-                    'service_status': self._simulate_check('service_status', host),
-                    'version_check': self._simulate_check('version_check', host),
-                    'port_check': self._simulate_check('port_check', host),
-                    'health_check': self._simulate_check('health_check', host),
-                    'connectivity_check': self._simulate_check('connectivity_check', host)
-                }
-                
-                # Determine overall status
-                all_passed = all(check['status'] == 'PASS' for check in host_checks.values())
-                host_status = 'PASS' if all_passed else 'FAIL'
-                
-                postcheck_results[host.name] = {
-                    'status': host_status,
-                    'checks': host_checks
-                }
-                
-                self.results['hosts'][host.name]['postcheck_status'] = host_status
-                self.results['hosts'][host.name]['status'] = 'completed' if host_status == 'PASS' else 'failed'
+            # Hosts skipped in Phase 3 were never upgraded, so there is nothing to validate
+            hosts = [h for h in hosts if host_views[h.name].get('upgrade_status') != 'skipped']
+            
+            results = await asyncio.gather(
+                *(self._bounded(self._check_host(host, _POSTCHECKS, 'postcheck')) for host in hosts),
+                return_exceptions=True
+            )
+            
+            for host, result in zip(hosts, results):
+                if isinstance(result, Exception):
+                    self.logger.error("    ❌ %s - Postchecks errored: %s", host.name, result)
+                    result = {'status': 'FAIL', 'checks': {}, 'error': str(result)}
                 
-                if host_status == 'PASS':
-                    self.logger.info(f"    ✅ {host.name} - All postchecks passed")
-                else:
-                    self.logger.warning(f"    ⚠️ {host.name} - Some postchecks failed")
+                host_status = result['status']
+                postcheck_results[host.name] = result
+                host_view = host_views[host.name]
+                host_view['postcheck_status'] = host_status
+                host_view['status'] = 'completed' if host_status == 'PASS' else 'failed'
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
@@ -320,39 +309,128 @@ class SiemplyPoC:
             }
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 4 failed: {e}")
+            self.logger.error("❌ Phase 4 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
     async def _phase_generate_report(self):
         """Phase 5: Generate Markdown report"""
         phase_name = "generate_report"
-        self.logger.info(f"📊 Phase 5: Generating Markdown report")
+        self.logger.info("📊 Phase 5: Generating Markdown report")
         
         try:
-            # Create reports directory
-            reports_dir = Path("reports")
-            reports_dir.mkdir(exist_ok=True)
-            
             # Generate report
             report_content = self._generate_markdown_report()
             
-            # Save report
-            report_file = reports_dir / f"siemply_poc_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            report_file.write_text(report_content)
+            # Save report; run_demo writes the raw results alongside it once timing is final
+            report_file = self.reports_dir / f"siemply_poc_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            results_file = report_file.with_suffix('.json')
+            await self._write_file(report_file, report_content)
             
             self.results['phases'][phase_name] = {
                 'status': 'success',
-                'report_file': str(report_file)
+                'report_file': str(report_file),
+                'results_file': str(results_file)
             }
             
-            self.logger.info(f"✅ Report generated: {report_file}")
+            self.logger.info("✅ Report generated: %s", report_file)
             
         except Exception as e:
-            self.logger.error(f"❌ Phase 5 failed: {e}")
+            self.logger.error("❌ Phase 5 failed: %s", e)
             self.results['phases'][phase_name] = {'status': 'failed', 'error': str(e)}
             raise
     
+    async def _write_results_json(self):
+        """Save the results dict to the JSON file named by the report phase"""
+        results_file = Path(self.results['phases']['generate_report']['results_file'])
+        await self._write_file(results_file, _dumps(self.results))
+        self.logger.info("✅ Results saved: %s", results_file)
+    
+    async def _bounded(self, coro):
+        """Await a per-host coroutine under the concurrency limit"""
+        async with self._ssh_sem:
+            return await coro
+    
+    async def _write_file(self, path: Path, content: str):
+        """Write a text file without blocking the event loop"""
+        if aiofiles is not None:
+            async with aiofiles.open(path, 'w') as f:
+                await f.write(content)
+        else:
+            await asyncio.to_thread(path.write_text, content)
+    
+    async def _upgrade_host(self, host, target_version: str) -> Dict[str, Any]:
+        """Run the upgrade step pipeline on a single host"""
+        self.logger.info("    Upgrading %s (%s)...", host.name, host.ansible_host)
+        
+        t0 = time.monotonic()
+        start_time = datetime.now().isoformat()
+        status = 'success'
+        error = None
+        steps = {}
+        
+        # Simulate upgrade steps; they depend on each other so run in order
+        for step_name, step_desc in _UPGRADE_STEPS:
+            step_desc = step_desc.format(version=target_version)
+            self.logger.info("      %s...", step_desc)
+            
+            # Simulate step execution
+            step_result = self._simulate_upgrade_step(step_name, host, target_version)
+            
+            steps[step_name] = {
+                'description': step_desc,
+                'status': step_result['status'],
+                'duration': step_result['duration'],
+                'output': step_result['output']
+            }
+            
+            if step_result['status'] == 'failed':
+                status = 'failed'
+                error = step_result['error']
+                break
+        
+        # Simulate the combined duration of the executed steps
+        await asyncio.sleep(0.5 * len(steps))
+        
+        host_upgrade = {
+            'status': status,
+            'steps': steps,
+            'start_time': start_time,
+            'end_time': datetime.now().isoformat(),
+            'duration': time.monotonic() - t0
+        }
+        if error is not None:
+            host_upgrade['error'] = error
+        
+        if host_upgrade['status'] == 'success':
+            self.logger.info("    ✅ %s - Upgrade completed successfully", host.name)
+        else:
+            self.logger.error("    ❌ %s - Upgrade failed: %s", host.name, host_upgrade.get('error', 'Unknown error'))
+        
+        return host_upgrade
+    
+    async def _check_host(self, host, check_types: Tuple[str, ...], kind: str) -> Dict[str, Any]:
+        """Run a set of checks against a single host"""
+        verb = 'Checking' if kind == 'precheck' else 'Validating'
+        self.logger.info("  %s %s (%s)...", verb, host.name, host.ansible_host)
+        
+        # Simulate checks (in real implementation, these would be actual checks)
+        host_checks = {check_type: self._simulate_check(check_type, host) for check_type in check_types}
+        
+        # Determine overall status
+        all_passed = all(check['status'] in _OK_STATUSES for check in host_checks.values())
+        host_status = 'PASS' if all_passed else 'FAIL'
+        
+        if host_status == 'PASS':
+            self.logger.info("    ✅ %s - All %ss passed", host.name, kind)
+        else:
+            self.logger.warning("    ⚠️ %s - Some %ss failed", host.name, kind)
+        
+        return {
+            'status': host_status,
+            'checks': host_checks
+        }
+    
     def _simulate_check(self, check_type: str, host) -> Dict[str, Any]:
         """Simulate a health check"""
         # Simulate different check results based on check type
@@ -389,7 +467,8 @@ class SiemplyPoC:
     
     def _generate_markdown_report(self) -> str:
         """Generate Markdown report"""
-        report = f"""# Siemply PoC Demo Report
+        status_counts = Counter(h.get('status', 'pending') for h in self.results['hosts'].values())
+        parts = [f"""# Siemply PoC Demo Report
 
 **Generated:** {datetime.now().isoformat()}  
 **Duration:** {self.results['duration']:.2f} seconds  
@@ -398,68 +477,71 @@ class SiemplyPoC:
 ## Summary
 
 - **Total Phases:** {len(self.results['phases'])}
-- **Total Hosts:** {len(self.results['hosts'])}
-- **Successful Hosts:** {sum(1 for h in self.results['hosts'].values() if h.get('status') == 'completed')}
-- **Failed Hosts:** {sum(1 for h in self.results['hosts'].values() if h.get('status') == 'failed')}
+- **Total Hosts:** {sum(status_counts.values())}
+- **Successful Hosts:** {status_counts['completed']}
+- **Failed Hosts:** {status_counts['failed']}
+- **Skipped Hosts:** {status_counts['skipped']}
 
 ## Phase Results
 
-"""
+"""]
         
         for phase_name, phase_data in self.results['phases'].items():
             status_emoji = "✅" if phase_data['status'] == 'success' else "❌"
-            report += f"### {status_emoji} {phase_name.replace('_', ' ').title()}\n\n"
-            report += f"**Status:** {phase_data['status'].upper()}\n"
+            parts.append(f"### {status_emoji} {phase_name.replace('_', ' ').title()}\n\n")
+            parts.append(f"**Status:** {phase_data['status'].upper()}\n")
             
             if 'error' in phase_data:
-                report += f"**Error:** {phase_data['error']}\n"
+                parts.append(f"**Error:** {phase_data['error']}\n")
             
             if 'hosts_found' in phase_data:
-                report += f"**Hosts Found:** {phase_data['hosts_found']}\n"
+                parts.append(f"**Hosts Found:** {phase_data['hosts_found']}\n")
             
-            report += "\n"
+            parts.append("\n")
         
-        report += "## Host Results\n\n"
+        parts.append("## Host Results\n\n")
         
         for host_name, host_data in self.results['hosts'].items():
-            status_emoji = "✅" if host_data.get('status') == 'completed' else "❌" if host_data.get('status') == 'failed' else "⏳"
-            report += f"### {status_emoji} {host_name}\n\n"
-            report += f"**Host:** {host_data['ansible_host']}\n"
-            report += f"**Splunk Type:** {host_data['splunk_type']}\n"
-            report += f"**Splunk Version:** {host_data['splunk_version']}\n"
-            report += f"**OS Family:** {host_data['os_family']}\n"
-            report += f"**Status:** {host_data.get('status', 'unknown')}\n"
+            status_emoji = STATUS_EMOJI.get(host_data.get('status'), "⏳")
+            parts.append(f"""### {status_emoji} {host_name}
+
+**Host:** {host_data['ansible_host']}
+**Splunk Type:** {host_data['splunk_type']}
+**Splunk Version:** {host_data['splunk_version']}
+**OS Family:** {host_data['os_family']}
+**Status:** {host_data.get('status', 'unknown')}
+""")
             
             if 'precheck_status' in host_data:
-                report += f"**Precheck Status:** {host_data['precheck_status']}\n"
+                parts.append(f"**Precheck Status:** {host_data['precheck_status']}\n")
             
             if 'upgrade_status' in host_data:
-                report += f"**Upgrade Status:** {host_data['upgrade_status']}\n"
+                parts.append(f"**Upgrade Status:** {host_data['upgrade_status']}\n")
             
             if 'postcheck_status' in host_data:
-                report += f"**Postcheck Status:** {host_data['postcheck_status']}\n"
+                parts.append(f"**Postcheck Status:** {host_data['postcheck_status']}\n")
             
-            report += "\n"
+            parts.append("\n")
         
         if self.results['errors']:
-            report += "## Errors\n\n"
+            parts.append("## Errors\n\n")
             for error in self.results['errors']:
-                report += f"- {error}\n"
-            report += "\n"
+                parts.append(f"- {error}\n")
+            parts.append("\n")
         
         if self.results['warnings']:
-            report += "## Warnings\n\n"
+            parts.append("## Warnings\n\n")
             for warning in self.results['warnings']:
-                report += f"- {warning}\n"
-            report += "\n"
+                parts.append(f"- {warning}\n")
+            parts.append("\n")
         
-        report += "## Next Steps\n\n"
-        report += "1. Review the results above\n"
-        report += "2. Check individual host statuses\n"
-        report += "3. Address any failed checks or upgrades\n"
-        report += "4. Run additional validation if needed\n"
+        parts.append("## Next Steps\n\n")
+        parts.append("1. Review the results above\n")
+        parts.append("2. Check individual host statuses\n")
+        parts.append("3. Address any failed checks or upgrades\n")
+        parts.append("4. Run additional validation if needed\n")
         
-        return report
+        return "".join(parts)
 
 
 async def main():
@@ -476,11 +558,13 @@ async def main():
     parser.add_argument('--group', '-g', default='prod-web', help='Target group')
     parser.add_argument('--version', '-v', default='9.2.2', help='Target version')
     parser.add_argument('--config-dir', '-c', default='config', help='Config directory')
+    parser.add_argument('--max-ssh', type=int, default=8,
+                        help='Maximum number of hosts worked on concurrently')
     
     args = parser.parse_args()
     
     # Create and run PoC
-    poc = SiemplyPoC(args.config_dir)
+    poc = SiemplyPoC(args.config_dir, args.max_ssh)
     
     try:
         await poc.initialize()
@@ -493,4 +577,11 @@ async def main():
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    # Prefer uvloop (installed with uvicorn[standard]) for SSH fan-out;
+    # uvloop.run (0.18+) avoids the event loop policy API deprecated in 3.12
+    try:
+        from uvloop import run
+    except ImportError:
+        run = asyncio.run
+    
+    run(main())
@@ -5,16 +5,20 @@ A lightweight, opinionated orchestration framework for managing Splunk
 Universal Forwarder and Splunk Enterprise deployments across Linux hosts.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "Siemply Framework"
 __email__ = "support@siemply.dev"
 
-from .core.orchestrator import Orchestrator
-from .core.task_runner import TaskRunner
-from .core.ssh_executor import SSHExecutor
-from .core.inventory import Inventory
-from .core.secrets import SecretsManager
-from .core.audit import AuditLogger
+if TYPE_CHECKING:
+    from .core.orchestrator import Orchestrator
+    from .core.task_runner import TaskRunner
+    from .core.ssh_executor import SSHExecutor
+    from .core.inventory import Inventory
+    from .core.secrets import SecretsManager
+    from .core.audit import AuditLogger
 
 __all__ = [
     "Orchestrator",
@@ -24,3 +28,27 @@ __all__ = [
     "SecretsManager",
     "AuditLogger",
 ]
+
+# Public name -> defining module; imported on first access (PEP 562) so that
+# importing the package does not pull in SSH and crypto dependencies
+_LAZY_IMPORTS = {
+    "Orchestrator": ".core.orchestrator",
+    "TaskRunner": ".core.task_runner",
+    "SSHExecutor": ".core.ssh_executor",
+    "Inventory": ".core.inventory",
+    "SecretsManager": ".core.secrets",
+    "AuditLogger": ".core.audit",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,51 +2,46 @@
 API Dependencies - Dependency injection functions
 """
 
-from fastapi import HTTPException
+from dataclasses import dataclass
+
+from fastapi.requests import HTTPConnection
 from ..core.orchestrator import Orchestrator
 from ..core.inventory import Inventory
 from ..core.audit import AuditLogger
 from ..core.secrets import SecretsManager
-
-# Global instances (will be initialized in main.py)
-orchestrator: Orchestrator = None
-inventory: Inventory = None
-audit_logger: AuditLogger = None
-secrets_manager: SecretsManager = None
+from ..core.ssh_executor import SSHExecutor
 
 
-def set_instances(orch, inv, audit, secrets):
-    """Set the global instances"""
-    global orchestrator, inventory, audit_logger, secrets_manager
-    orchestrator = orch
-    inventory = inv
-    audit_logger = audit
-    secrets_manager = secrets
+@dataclass(slots=True)
+class AppState:
+    """Core components, created once by the lifespan and stored on app.state.core"""
+    orchestrator: Orchestrator
+    inventory: Inventory
+    audit_logger: AuditLogger
+    secrets_manager: SecretsManager
+    ssh_executor: SSHExecutor
 
 
-async def get_orchestrator() -> Orchestrator:
+async def get_orchestrator(conn: HTTPConnection) -> Orchestrator:
     """Get orchestrator instance"""
-    if not orchestrator:
-        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
-    return orchestrator
+    return conn.app.state.core.orchestrator
 
 
-async def get_inventory() -> Inventory:
+async def get_inventory(conn: HTTPConnection) -> Inventory:
     """Get inventory instance"""
-    if not inventory:
-        raise HTTPException(status_code=503, detail="Inventory not initialized")
-    return inventory
+    return conn.app.state.core.inventory
 
 
-async def get_audit_logger() -> AuditLogger:
+async def get_audit_logger(conn: HTTPConnection) -> AuditLogger:
     """Get audit logger instance"""
-    if not audit_logger:
-        raise HTTPException(status_code=503, detail="Audit logger not initialized")
-    return audit_logger
+    return conn.app.state.core.audit_logger
 
 
-async def get_secrets_manager() -> SecretsManager:
+async def get_secrets_manager(conn: HTTPConnection) -> SecretsManager:
     """Get secrets manager instance"""
-    if not secrets_manager:
-        raise HTTPException(status_code=503, detail="Secrets manager not initialized")
-    return secrets_manager
+    return conn.app.state.core.secrets_manager
+
+
+async def get_ssh_executor(conn: HTTPConnection) -> SSHExecutor:
+    """Get the shared SSH executor, whose connections are reused across requests"""
+    return conn.app.state.core.ssh_executor
@@ -3,70 +3,193 @@ Siemply Web API - Main FastAPI application
 """
 
 import asyncio
+import copy
+import hashlib
 import logging
-from contextlib import asynccontextmanager
+import logging.handlers
+import os
+import queue
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any
 
-from fastapi import FastAPI, HTTPException, Depends
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-import uvicorn
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 from .routes import hosts, runs, audit, health, websocket
-from .dependencies import set_instances
+from .dependencies import AppState
 from ..core.orchestrator import Orchestrator
 from ..core.inventory import Inventory
 from ..core.audit import AuditLogger
 from ..core.secrets import SecretsManager
+from ..core.ssh_executor import SSHExecutor
 
 
-# Global orchestrator instance
-orchestrator: Orchestrator = None
-inventory: Inventory = None
-audit_logger: AuditLogger = None
-secrets_manager: SecretsManager = None
+# Served at / when the React build is not available
+_FALLBACK_HTML = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Siemply Web Interface</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 40px; }
+                .container { max-width: 800px; margin: 0 auto; }
+                .header { background: #f0f0f0; padding: 20px; border-radius: 5px; }
+                .content { margin: 20px 0; }
+                .api-link { display: inline-block; margin: 10px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🚀 Siemply Web Interface</h1>
+                    <p>Splunk Infrastructure Orchestration Framework</p>
+                </div>
+                <div class="content">
+                    <h2>API Endpoints</h2>
+                    <a href="/docs" class="api-link">📚 API Documentation</a>
+                    <a href="/api/health" class="api-link">❤️ Health Check</a>
+                    <a href="/api/hosts" class="api-link">🖥️ Hosts</a>
+                    <a href="/api/runs" class="api-link">🏃 Runs</a>
+                    <a href="/api/audit" class="api-link">📊 Audit</a>
+                    
+                    <h2>Getting Started</h2>
+                    <p>To use the full web interface, build the React frontend:</p>
+                    <pre><code>cd web
+npm install
+npm run build</code></pre>
+                </div>
+            </div>
+        </body>
+        </html>
+        """.encode("utf-8")
 
+# Browsers may reuse cached / and /api/status responses for this long
+_CACHE_CONTROL = "public, max-age=60"
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan manager"""
-    global orchestrator, inventory, audit_logger, secrets_manager
+
+@lru_cache(maxsize=8)
+def _etag(body: bytes) -> str:
+    """Strong ETag for a precomputed response body"""
+    return '"%s"' % hashlib.md5(body).hexdigest()
+
+
+def _cached_response(request: Request, body: bytes, media_type: str) -> Response:
+    """Build a response for a precomputed body, answering 304 when the client's ETag matches"""
+    etag = _etag(body)
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records unformatted
     
-    # Startup
-    logging.info("Starting Siemply Web API...")
+    The stock prepare() merges args into msg and clears record.args, which
+    breaks formatters that read the args themselves, such as uvicorn's
+    access log formatter. The listener's handlers format the record instead.
+    """
     
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+@contextmanager
+def _queued_log_handlers(*names: str):
+    """Route the named loggers through QueueHandlers so handler I/O runs off the event loop"""
+    queued = []
+    for name in names:
+        logger = logging.getLogger(name)
+        handlers = logger.handlers[:]
+        if not handlers:
+            continue
+        log_queue = queue.SimpleQueue()
+        queue_handler = _RecordQueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        listener.start()
+        queued.append((logger, queue_handler, listener))
     try:
-        # Initialize core components
-        orchestrator = Orchestrator()
-        await orchestrator.initialize()
-        
-        inventory = Inventory()
-        await inventory.load()
-        
-        audit_logger = AuditLogger()
-        await audit_logger.initialize()
+        yield
+    finally:
+        for logger, queue_handler, listener in queued:
+            listener.stop()
+            logger.removeHandler(queue_handler)
+            for handler in listener.handlers:
+                logger.addHandler(handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager"""
+    # Hand existing handlers to background listener threads for the app's lifetime
+    with _queued_log_handlers("", "uvicorn", "uvicorn.access"):
+        # Startup
+        logging.info("Starting Siemply Web API...")
         
-        secrets_manager = SecretsManager()
-        await secrets_manager.load()
+        try:
+            # Initialize core components
+            orchestrator = Orchestrator()
+            await orchestrator.initialize()
+            
+            inventory = Inventory()
+            await inventory.load()
+            
+            audit_logger = AuditLogger()
+            await audit_logger.initialize()
+            
+            secrets_manager = SecretsManager()
+            await secrets_manager.load()
+            
+            # Set instances for dependency injection; API routes share one
+            # SSH executor so host connections survive between requests
+            ssh_executor = SSHExecutor(secrets_manager)
+            app.state.core = AppState(orchestrator, inventory, audit_logger, secrets_manager, ssh_executor)
+            
+            # Precompute static responses; components are fixed after startup
+            try:
+                app.state.index_html = Path("web/index.html").read_bytes()
+            except FileNotFoundError:
+                app.state.index_html = _FALLBACK_HTML
+            app.state.status_body = orjson.dumps({
+                "status": "healthy",
+                "version": "1.0.0",
+                "components": {
+                    "orchestrator": orchestrator is not None,
+                    "inventory": inventory is not None,
+                    "audit_logger": audit_logger is not None,
+                    "secrets_manager": secrets_manager is not None
+                }
+            })
+            
+            logging.info("Siemply Web API started successfully")
         
-        # Set instances for dependency injection
-        set_instances(orchestrator, inventory, audit_logger, secrets_manager)
+        except Exception as e:
+            logging.error("Failed to start Siemply Web API: %s", e)
+            raise
         
-        logging.info("Siemply Web API started successfully")
+        yield
         
-    except Exception as e:
-        logging.error(f"Failed to start Siemply Web API: {e}")
-        raise
-    
-    yield
-    
-    # Shutdown
-    logging.info("Shutting down Siemply Web API...")
-    if orchestrator:
-        await orchestrator.ssh_executor.close_all_connections()
-    logging.info("Siemply Web API shutdown complete")
+        # Shutdown
+        logging.info("Shutting down Siemply Web API...")
+        if orchestrator:
+            await orchestrator.ssh_executor.close_all_connections()
+        await ssh_executor.close_all_connections()
+        logging.info("Siemply Web API shutdown complete")
 
 
 # Create FastAPI application
@@ -74,19 +197,28 @@ app = FastAPI(
     title="Siemply Web API",
     description="Web API for Splunk Infrastructure Orchestration Framework",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS is only needed when the UI is served from another origin; same-origin
+# deployments skip the middleware entirely
+if os.getenv("SIEMPLY_CORS_ORIGINS"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=os.environ["SIEMPLY_CORS_ORIGINS"].split(","),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        max_age=86400,
+    )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Prefer Brotli for text payloads; it still serves gzip to clients without br support
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=512)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=512)
 
 # Include routers
 app.include_router(hosts.router, prefix="/api/hosts", tags=["hosts"])
@@ -96,7 +228,6 @@ app.include_router(health.router, prefix="/api/health", tags=["health"])
 app.include_router(websocket.router, prefix="/api/ws", tags=["websocket"])
 
 # Mount static files (only if directory exists)
-import os
 if os.path.exists("web/static"):
     app.mount("/static", StaticFiles(directory="web/static"), name="static")
 elif os.path.exists("web/build/static"):
@@ -110,49 +241,9 @@ else:
 
 # Serve React app
 @app.get("/", response_class=HTMLResponse)
-async def serve_react_app():
+async def serve_react_app(request: Request):
     """Serve the React application"""
-    try:
-        with open("web/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Siemply Web Interface</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 40px; }
-                .container { max-width: 800px; margin: 0 auto; }
-                .header { background: #f0f0f0; padding: 20px; border-radius: 5px; }
-                .content { margin: 20px 0; }
-                .api-link { display: inline-block; margin: 10px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🚀 Siemply Web Interface</h1>
-                    <p>Splunk Infrastructure Orchestration Framework</p>
-                </div>
-                <div class="content">
-                    <h2>API Endpoints</h2>
-                    <a href="/docs" class="api-link">📚 API Documentation</a>
-                    <a href="/api/health" class="api-link">❤️ Health Check</a>
-                    <a href="/api/hosts" class="api-link">🖥️ Hosts</a>
-                    <a href="/api/runs" class="api-link">🏃 Runs</a>
-                    <a href="/api/audit" class="api-link">📊 Audit</a>
-                    
-                    <h2>Getting Started</h2>
-                    <p>To use the full web interface, build the React frontend:</p>
-                    <pre><code>cd web
-npm install
-npm run build</code></pre>
-                </div>
-            </div>
-        </body>
-        </html>
-        """)
+    return _cached_response(request, request.app.state.index_html, "text/html; charset=utf-8")
 
 
 # Import dependency functions
@@ -161,25 +252,24 @@ from .dependencies import get_orchestrator, get_inventory, get_audit_logger, get
 
 # Health check endpoint
 @app.get("/api/status")
-async def get_status():
+async def get_status(request: Request):
     """Get API status"""
-    return {
-        "status": "healthy",
-        "version": "1.0.0",
-        "components": {
-            "orchestrator": orchestrator is not None,
-            "inventory": inventory is not None,
-            "audit_logger": audit_logger is not None,
-            "secrets_manager": secrets_manager is not None
-        }
-    }
+    return _cached_response(request, request.app.state.status_body, "application/json")
 
 
 if __name__ == "__main__":
+    import uvicorn
+    
+    # SIEMPLY_WORKERS > 1 forks a process pool; each worker runs its own
+    # lifespan, so the component instances are per-process
     uvicorn.run(
         "siemply.api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        # uvloop and httptools when installed (uvloop is not on Windows)
+        loop="auto",
+        http="auto",
+        reload=bool(int(os.getenv("SIEMPLY_RELOAD", "0"))),
+        log_level=os.getenv("SIEMPLY_LOG", "info"),
+        workers=int(os.getenv("SIEMPLY_WORKERS", "1"))
     )
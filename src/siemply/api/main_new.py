@@ -1,66 +1,153 @@
 """
 Enhanced FastAPI application with Host Management
 """
+import hashlib
+import logging
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 
 from ..database.database import create_tables
+from .middleware import ETagMiddleware
 from .routes import hosts_new, playbooks_new, runs_new
 
+# The app is started through uvicorn, which only configures its own loggers;
+# log through its general logger so startup messages reach the console
+logger = logging.getLogger("uvicorn.error")
+
+
+# Served at / when no React build is present
+_FALLBACK_HTML = """
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>Siemply Host Management</title>
+                <style>
+                    body { font-family: Arial, sans-serif; margin: 40px; }
+                    .container { max-width: 800px; margin: 0 auto; }
+                    .header { background: #f0f0f0; padding: 20px; border-radius: 5px; }
+                    .content { margin: 20px 0; }
+                    .api-link { display: inline-block; margin: 10px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="header">
+                        <h1>🚀 Siemply Host Management</h1>
+                        <p>Enhanced host management and playbook execution for Splunk infrastructure</p>
+                    </div>
+                    <div class="content">
+                        <h2>API Endpoints</h2>
+                        <a href="/docs" class="api-link">API Documentation</a>
+                        <a href="/api/hosts" class="api-link">Hosts API</a>
+                        <a href="/api/playbooks" class="api-link">Playbooks API</a>
+                        <a href="/api/runs" class="api-link">Runs API</a>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """.encode("utf-8")
+
+# /api/status payload; it never changes, so it is serialized once
+_STATUS_BODY = orjson.dumps({
+    "status": "healthy",
+    "version": "2.0.0",
+    "features": ["host_management", "playbook_execution", "ssh_connectivity"],
+    "components": {
+        "database": "connected",
+        "ssh_runner": "ready",
+        "playbook_engine": "ready"
+    }
+})
+
+# Index page locations, in order of preference
+_INDEX_CANDIDATES = ("web/build/index.html", "web/index.html")
+
+
+def _load_index_page(app: FastAPI):
+    """Read the index page once and precompute its cache headers"""
+    for candidate in _INDEX_CANDIDATES:
+        if os.path.exists(candidate):
+            with open(candidate, "rb") as f:
+                body = f.read()
+            break
+    else:
+        body = _FALLBACK_HTML
+    
+    etag = hashlib.md5(body).hexdigest()
+    app.state.index_html_bytes = body
+    app.state.index_headers = {
+        "Cache-Control": "public, max-age=3600",
+        "ETag": f'"{etag}"',
+    }
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-hashed build assets, cacheable by clients for a year"""
+    
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print("🚀 Starting Siemply Host Management API...")
+    logger.info("🚀 Starting Siemply Host Management API...")
+    
+    _load_index_page(app)
     
     # Create database tables
     create_tables()
-    print("✅ Database tables created")
+    logger.info("✅ Database tables created")
     
     # Initialize sample data if needed
     from ..database.database import SessionLocal
     from ..database.models import Host, Playbook
-    from ..playbooks.schema import SAMPLE_PLAYBOOKS
-    import yaml
     
     db = SessionLocal()
     try:
         # Check if we have any hosts
-        host_count = db.query(Host).count()
-        if host_count == 0:
-            print("📝 No hosts found - ready for first host addition")
-        
-        # Check if we have any playbooks
-        playbook_count = db.query(Playbook).count()
-        if playbook_count == 0:
-            print("📝 No playbooks found - ready for first playbook creation")
+        if db.query(Host.id).first() is None:
+            logger.info("📝 No hosts found - ready for first host addition")
         
-        # Create sample playbooks if none exist
-        if playbook_count == 0:
-            for sample_name, sample_data in SAMPLE_PLAYBOOKS.items():
-                yaml_content = yaml.dump(sample_data, default_flow_style=False)
-                playbook = Playbook(
-                    name=sample_data["name"],
-                    description=sample_data.get("description"),
-                    yaml_content=yaml_content
-                )
-                db.add(playbook)
+        # Create sample playbooks if none exist. The YAML dumper and sample
+        # data are only imported on this first-run path; libyaml's dumper is
+        # used when available, with one bulk INSERT instead of per-object
+        # unit-of-work tracking
+        if db.query(Playbook.id).first() is None:
+            logger.info("📝 No playbooks found - ready for first playbook creation")
+            
+            import yaml
+            from ..playbooks.schema import SAMPLE_PLAYBOOKS
+            
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            db.bulk_insert_mappings(Playbook, [
+                {
+                    "name": sample_data["name"],
+                    "description": sample_data.get("description"),
+                    "yaml_content": yaml.dump(sample_data, Dumper=dumper, default_flow_style=False)
+                }
+                for sample_data in SAMPLE_PLAYBOOKS.values()
+            ])
             db.commit()
-            print("✅ Sample playbooks created")
+            logger.info("✅ Sample playbooks created")
         
     finally:
         db.close()
     
-    print("✅ Siemply Host Management API ready!")
+    logger.info("✅ Siemply Host Management API ready!")
     
     yield
     
     # Shutdown
-    print("🛑 Shutting down Siemply Host Management API...")
+    logger.info("🛑 Shutting down Siemply Host Management API...")
 
 
 # Create FastAPI app
@@ -68,7 +155,8 @@ app = FastAPI(
     title="Siemply Host Management API",
     description="Enhanced host management and playbook execution for Splunk infrastructure",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -80,6 +168,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Content-hash ETags for the list endpoints; added before GZip so it hashes the uncompressed body
+app.add_middleware(ETagMiddleware, paths=("/api/hosts", "/api/playbooks", "/api/runs"))
+
+# Compresses API responses, static assets and the index page
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Include routers
 app.include_router(hosts_new.router, prefix="/api/hosts", tags=["hosts"])
 app.include_router(playbooks_new.router, prefix="/api/playbooks", tags=["playbooks"])
@@ -87,66 +181,19 @@ app.include_router(runs_new.router, prefix="/api/runs", tags=["runs"])
 
 # Mount static files
 if os.path.exists("web/build/static"):
-    app.mount("/static", StaticFiles(directory="web/build/static"), name="static")
+    app.mount("/static", ImmutableStaticFiles(directory="web/build/static"), name="static")
 elif os.path.exists("web/static"):
     app.mount("/static", StaticFiles(directory="web/static"), name="static")
 
 # Serve React app
 @app.get("/", response_class=HTMLResponse)
-async def serve_react_app():
+async def serve_react_app(request: Request):
     """Serve the React application"""
-    try:
-        if os.path.exists("web/build/index.html"):
-            with open("web/build/index.html", "r") as f:
-                return HTMLResponse(content=f.read())
-        elif os.path.exists("web/index.html"):
-            with open("web/index.html", "r") as f:
-                return HTMLResponse(content=f.read())
-        else:
-            return HTMLResponse(content="""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Siemply Host Management</title>
-                <style>
-                    body { font-family: Arial, sans-serif; margin: 40px; }
-                    .container { max-width: 800px; margin: 0 auto; }
-                    .header { background: #f0f0f0; padding: 20px; border-radius: 5px; }
-                    .content { margin: 20px 0; }
-                    .api-link { display: inline-block; margin: 10px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🚀 Siemply Host Management</h1>
-                        <p>Enhanced host management and playbook execution for Splunk infrastructure</p>
-                    </div>
-                    <div class="content">
-                        <h2>API Endpoints</h2>
-                        <a href="/docs" class="api-link">API Documentation</a>
-                        <a href="/api/hosts" class="api-link">Hosts API</a>
-                        <a href="/api/playbooks" class="api-link">Playbooks API</a>
-                        <a href="/api/runs" class="api-link">Runs API</a>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """)
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Siemply Host Management API</h1><p>API is running. Check <a href='/docs'>/docs</a> for documentation.</p>")
+    state = request.app.state
+    return Response(state.index_html_bytes, media_type="text/html", headers=state.index_headers)
 
 
 @app.get("/api/status")
 async def get_status():
     """Get API status"""
-    return {
-        "status": "healthy",
-        "version": "2.0.0",
-        "features": ["host_management", "playbook_execution", "ssh_connectivity"],
-        "components": {
-            "database": "connected",
-            "ssh_runner": "ready",
-            "playbook_engine": "ready"
-        }
-    }
+    return Response(_STATUS_BODY, media_type="application/json")
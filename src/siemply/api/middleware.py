@@ -0,0 +1,81 @@
+"""
+API Middleware - ASGI middleware shared by the API applications
+"""
+
+import hashlib
+from typing import Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ETagMiddleware:
+    """
+    Add content-hash ETags to GET responses and answer matching
+    If-None-Match requests with 304 Not Modified
+    
+    Only complete 200 responses under the given path prefixes are tagged;
+    streamed responses (more than one body message) and responses that
+    already carry an ETag pass through unchanged.
+    """
+    
+    def __init__(self, app: ASGIApp, paths: Tuple[str, ...] = ("/api/",), max_age: int = 5):
+        self.app = app
+        self.paths = paths
+        self.cache_control = f"private, max-age={max_age}"
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or not scope["path"].startswith(self.paths)):
+            await self.app(scope, receive, send)
+            return
+        
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message = {}
+        passthrough = False
+        
+        async def send_with_etag(message: Message):
+            nonlocal start_message, passthrough
+            
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                if message["status"] != 200 or "etag" in headers:
+                    passthrough = True
+                    await send(message)
+                return
+            
+            if message.get("more_body", False):
+                # Streaming response; it cannot be hashed up front
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            etag = '"%s"' % hashlib.blake2s(body).hexdigest()[:16]
+            
+            if if_none_match and (if_none_match.strip() == "*"
+                                  or etag in (tag.strip() for tag in if_none_match.split(","))):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (b"etag", etag.encode()),
+                        (b"cache-control", self.cache_control.encode()),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+            
+            headers = MutableHeaders(scope=start_message)
+            headers["ETag"] = etag
+            headers.setdefault("Cache-Control", self.cache_control)
+            await send(start_message)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_etag)
@@ -2,8 +2,15 @@
 Audit API Routes - Audit and logging endpoints
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import csv
+import hashlib
+from itertools import islice
+from typing import Annotated, List, Optional, Dict, Any, Iterator, Callable, Awaitable
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -13,11 +20,35 @@ from ..dependencies import get_audit_logger
 
 router = APIRouter()
 
+# Recent /report and /stats results keyed by their inputs; dashboards poll
+# these every few seconds while the underlying data rarely changes
+_RESULT_CACHE_TTL = 15
+_RESULT_CACHE = TTLCache(maxsize=128, ttl=_RESULT_CACHE_TTL)
+
+# Bumped by /cleanup so ETags issued before a deletion stop matching
+_cleanup_generation = 0
+
+
+def parse_iso(name: str) -> Callable[..., Optional[datetime]]:
+    """Build a dependency that parses the ISO-8601 query parameter `name`, answering 422 if malformed"""
+    def _parse(value: Optional[str] = Query(None, alias=name, description="Time filter (ISO format)")) -> Optional[datetime]:
+        if value is None:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid {name}: expected ISO 8601 datetime")
+    return _parse
+
+
+StartTime = Annotated[Optional[datetime], Depends(parse_iso("start_time"))]
+EndTime = Annotated[Optional[datetime], Depends(parse_iso("end_time"))]
+
 
 # Pydantic models
 class AuditEventResponse(BaseModel):
     event_id: str
-    timestamp: str
+    timestamp: datetime
     event_type: str
     user: str
     host: str
@@ -36,8 +67,8 @@ class TaskExecutionResponse(BaseModel):
     host: str
     task_name: str
     task_type: str
-    start_time: str
-    end_time: str
+    start_time: datetime
+    end_time: datetime
     duration: float
     status: str
     output: str
@@ -57,10 +88,10 @@ class AuditReportResponse(BaseModel):
     event_type_counts: Dict[str, int]
 
 
-@router.get("/events", response_model=List[AuditEventResponse])
+@router.get("/events", response_model=List[AuditEventResponse], response_model_exclude_none=True)
 async def get_audit_events(
-    start_time: Optional[str] = Query(None, description="Start time filter (ISO format)"),
-    end_time: Optional[str] = Query(None, description="End time filter (ISO format)"),
+    start_dt: StartTime,
+    end_dt: EndTime,
     event_type: Optional[str] = Query(None, description="Event type filter"),
     user: Optional[str] = Query(None, description="User filter"),
     host: Optional[str] = Query(None, description="Host filter"),
@@ -70,10 +101,6 @@ async def get_audit_events(
 ):
     """Get audit events with filters"""
     try:
-        # Parse time filters
-        start_dt = datetime.fromisoformat(start_time) if start_time else None
-        end_dt = datetime.fromisoformat(end_time) if end_time else None
-        
         # Get events
         events = await audit_logger.get_events(
             start_time=start_dt,
@@ -85,12 +112,12 @@ async def get_audit_events(
             limit=limit
         )
         
-        # Convert to response format
+        # Convert to response format; rows come from our own database, so skip validation
         event_responses = []
         for event in events:
-            event_responses.append(AuditEventResponse(
+            event_responses.append(AuditEventResponse.model_construct(
                 event_id=event.event_id,
-                timestamp=event.timestamp.isoformat(),
+                timestamp=event.timestamp,
                 event_type=event.event_type,
                 user=event.user,
                 host=event.host,
@@ -109,7 +136,7 @@ async def get_audit_events(
         raise HTTPException(status_code=500, detail=f"Failed to get audit events: {str(e)}")
 
 
-@router.get("/task-executions", response_model=List[TaskExecutionResponse])
+@router.get("/task-executions", response_model=List[TaskExecutionResponse], response_model_exclude_none=True)
 async def get_task_executions(
     run_id: Optional[str] = Query(None, description="Run ID filter"),
     host: Optional[str] = Query(None, description="Host filter"),
@@ -127,17 +154,17 @@ async def get_task_executions(
             limit=limit
         )
         
-        # Convert to response format
+        # Convert to response format; rows come from our own database, so skip validation
         execution_responses = []
         for execution in executions:
-            execution_responses.append(TaskExecutionResponse(
+            execution_responses.append(TaskExecutionResponse.model_construct(
                 task_id=execution.task_id,
                 run_id=execution.run_id,
                 host=execution.host,
                 task_name=execution.task_name,
                 task_type=execution.task_type,
-                start_time=execution.start_time.isoformat(),
-                end_time=execution.end_time.isoformat(),
+                start_time=execution.start_time,
+                end_time=execution.end_time,
                 duration=execution.duration,
                 status=execution.status,
                 output=execution.output,
@@ -154,30 +181,34 @@ async def get_task_executions(
 
 @router.get("/report", response_model=AuditReportResponse)
 async def get_audit_report(
-    start_time: Optional[str] = Query(None, description="Start time filter (ISO format)"),
-    end_time: Optional[str] = Query(None, description="End time filter (ISO format)"),
+    request: Request,
+    response: Response,
+    start_dt: StartTime,
+    end_dt: EndTime,
     format: str = Query("json", description="Report format"),
     audit_logger: AuditLogger = Depends(get_audit_logger)
 ):
     """Generate audit report"""
     try:
-        # Parse time filters
-        start_dt = datetime.fromisoformat(start_time) if start_time else None
-        end_dt = datetime.fromisoformat(end_time) if end_time else None
+        async def build_report():
+            report = await audit_logger.generate_audit_report(
+                start_time=start_dt,
+                end_time=end_dt,
+                format=format,
+                include_records=False
+            )
+            
+            if format == "json":
+                return AuditReportResponse(**report)
+            else:
+                # For markdown/html, return the raw content
+                return {"content": report, "format": format}
         
-        # Generate report
-        report = await audit_logger.generate_audit_report(
-            start_time=start_dt,
-            end_time=end_dt,
-            format=format
+        return await _cached_result(
+            request, response, audit_logger,
+            ("report", start_dt, end_dt, format), build_report
         )
         
-        if format == "json":
-            return AuditReportResponse(**report)
-        else:
-            # For markdown/html, return the raw content
-            return {"content": report, "format": format}
-        
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate audit report: {str(e)}")
 
@@ -198,6 +229,8 @@ async def get_run_summary(
 
 @router.get("/stats")
 async def get_audit_stats(
+    request: Request,
+    response: Response,
     days: int = Query(30, description="Number of days to include"),
     audit_logger: AuditLogger = Depends(get_audit_logger)
 ):
@@ -207,186 +240,183 @@ async def get_audit_stats(
         end_time = datetime.now()
         start_time = datetime.fromtimestamp(end_time.timestamp() - (days * 24 * 60 * 60))
         
-        # Get events for the period
-        events = await audit_logger.get_events(
-            start_time=start_time,
-            end_time=end_time,
-            limit=10000
-        )
-        
-        # Get task executions for the period
-        executions = await audit_logger.get_task_executions(limit=10000)
-        
-        # Calculate statistics
-        total_events = len(events)
-        total_tasks = len(executions)
-        
-        # Event status counts
-        event_status_counts = {}
-        for event in events:
-            status = event.status
-            event_status_counts[status] = event_status_counts.get(status, 0) + 1
-        
-        # Task status counts
-        task_status_counts = {}
-        for execution in executions:
-            status = execution.status
-            task_status_counts[status] = task_status_counts.get(status, 0) + 1
-        
-        # User activity
-        user_counts = {}
-        for event in events:
-            user = event.user
-            user_counts[user] = user_counts.get(user, 0) + 1
-        
-        # Host activity
-        host_counts = {}
-        for event in events:
-            host = event.host
-            host_counts[host] = host_counts.get(host, 0) + 1
-        
-        # Event type counts
-        event_type_counts = {}
-        for event in events:
-            event_type = event.event_type
-            event_type_counts[event_type] = event_type_counts.get(event_type, 0) + 1
-        
-        # Calculate average task duration
-        avg_task_duration = 0
-        if executions:
-            total_duration = sum(execution.duration for execution in executions)
-            avg_task_duration = total_duration / len(executions)
+        async def build_stats():
+            # Aggregate in the database; the two queries are independent
+            event_counts, task_summary = await asyncio.gather(
+                audit_logger.aggregate_events(start_time=start_time, end_time=end_time),
+                audit_logger.aggregate_task_executions()
+            )
+            
+            return {
+                "period_days": days,
+                "total_events": sum(event_counts["status"].values()),
+                "total_tasks": task_summary["total"],
+                "avg_task_duration": task_summary["avg_duration"],
+                "event_status_counts": event_counts["status"],
+                "task_status_counts": task_summary["status_counts"],
+                "user_counts": event_counts["user"],
+                "host_counts": event_counts["host"],
+                "event_type_counts": event_counts["event_type"]
+            }
         
-        return {
-            "period_days": days,
-            "total_events": total_events,
-            "total_tasks": total_tasks,
-            "avg_task_duration": avg_task_duration,
-            "event_status_counts": event_status_counts,
-            "task_status_counts": task_status_counts,
-            "user_counts": user_counts,
-            "host_counts": host_counts,
-            "event_type_counts": event_type_counts
-        }
+        # The rolling window drops old events as time passes, so the key
+        # also carries the current minute
+        return await _cached_result(
+            request, response, audit_logger,
+            ("stats", days, int(end_time.timestamp() // 60)), build_stats
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get audit stats: {str(e)}")
 
 
-@router.post("/cleanup")
+@router.post("/cleanup", status_code=202)
 async def cleanup_old_events(
+    background_tasks: BackgroundTasks,
     days: int = Query(90, description="Number of days to retain"),
     audit_logger: AuditLogger = Depends(get_audit_logger)
 ):
-    """Clean up old audit events"""
+    """Schedule cleanup of old audit events; deletion runs after the response is sent"""
+    background_tasks.add_task(_run_cleanup, audit_logger, days)
+    return {"message": f"Cleanup of events older than {days} days scheduled"}
+
+
+async def _run_cleanup(audit_logger: AuditLogger, days: int):
+    """Background body of /cleanup"""
+    global _cleanup_generation
     try:
         await audit_logger.cleanup_old_events(days)
-        return {"message": f"Cleaned up events older than {days} days"}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to cleanup old events: {str(e)}")
+    except Exception:
+        pass  # AuditLogger has already logged the failure
+    finally:
+        # Deleting rows does not raise the rowid high-water mark the cache
+        # validators use, so drop cached results explicitly; a failed run
+        # may still have removed some chunks
+        _cleanup_generation += 1
+        _RESULT_CACHE.clear()
 
 
 @router.get("/export")
 async def export_audit_data(
-    start_time: Optional[str] = Query(None, description="Start time filter (ISO format)"),
-    end_time: Optional[str] = Query(None, description="End time filter (ISO format)"),
+    start_dt: StartTime,
+    end_dt: EndTime,
     format: str = Query("json", description="Export format"),
     audit_logger: AuditLogger = Depends(get_audit_logger)
 ):
     """Export audit data"""
     try:
-        # Parse time filters
-        start_dt = datetime.fromisoformat(start_time) if start_time else None
-        end_dt = datetime.fromisoformat(end_time) if end_time else None
+        # Rows are read from the database as the response is sent; CSV
+        # exports contain events only, so executions are not queried for them
+        events = audit_logger.iter_events(start_time=start_dt, end_time=end_dt)
         
-        # Get events
-        events = await audit_logger.get_events(
-            start_time=start_dt,
-            end_time=end_dt,
-            limit=10000
-        )
-        
-        # Get task executions
-        executions = await audit_logger.get_task_executions(limit=10000)
+        if format == "csv":
+            return StreamingResponse(
+                _events_csv(events),
+                media_type="text/csv",
+                headers={"Content-Disposition": "attachment; filename=audit_events.csv"}
+            )
         
-        # Convert to export format
-        export_data = {
+        executions = audit_logger.iter_task_executions()
+        export_meta = {
             "export_timestamp": datetime.now().isoformat(),
             "period": {
-                "start_time": start_time,
-                "end_time": end_time
-            },
-            "events": [
-                {
-                    "event_id": event.event_id,
-                    "timestamp": event.timestamp.isoformat(),
-                    "event_type": event.event_type,
-                    "user": event.user,
-                    "host": event.host,
-                    "action": event.action,
-                    "status": event.status,
-                    "details": event.details,
-                    "run_id": event.run_id,
-                    "task_id": event.task_id,
-                    "duration": event.duration,
-                    "error": event.error
-                }
-                for event in events
-            ],
-            "task_executions": [
-                {
-                    "task_id": execution.task_id,
-                    "run_id": execution.run_id,
-                    "host": execution.host,
-                    "task_name": execution.task_name,
-                    "task_type": execution.task_type,
-                    "start_time": execution.start_time.isoformat(),
-                    "end_time": execution.end_time.isoformat(),
-                    "duration": execution.duration,
-                    "status": execution.status,
-                    "output": execution.output,
-                    "error": execution.error,
-                    "changed": execution.changed,
-                    "facts": execution.facts
-                }
-                for execution in executions
-            ]
+                "start_time": start_dt.isoformat() if start_dt else None,
+                "end_time": end_dt.isoformat() if end_dt else None
+            }
         }
-        
-        if format == "csv":
-            # Convert to CSV format (simplified)
-            import csv
-            import io
-            
-            output = io.StringIO()
-            
-            # Write events CSV
-            if events:
-                writer = csv.DictWriter(output, fieldnames=[
-                    "event_id", "timestamp", "event_type", "user", "host", 
-                    "action", "status", "run_id", "task_id", "duration", "error"
-                ])
-                writer.writeheader()
-                for event in events:
-                    writer.writerow({
-                        "event_id": event.event_id,
-                        "timestamp": event.timestamp.isoformat(),
-                        "event_type": event.event_type,
-                        "user": event.user,
-                        "host": event.host,
-                        "action": event.action,
-                        "status": event.status,
-                        "run_id": event.run_id or "",
-                        "task_id": event.task_id or "",
-                        "duration": event.duration or 0,
-                        "error": event.error or ""
-                    })
-            
-            return {"content": output.getvalue(), "format": "csv"}
-        
-        else:
-            return export_data
+        return StreamingResponse(
+            _export_json(export_meta, events, executions),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to export audit data: {str(e)}")
+
+
+# Rows per chunk handed to the response stream
+_EXPORT_BATCH_SIZE = 500
+
+_EVENT_CSV_FIELDS = (
+    "event_id", "timestamp", "event_type", "user", "host",
+    "action", "status", "run_id", "task_id", "duration", "error"
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the data, so csv.writer yields rows"""
+    
+    def write(self, value: str) -> str:
+        return value
+
+
+def _events_csv(events: Iterator[AuditEvent]) -> Iterator[str]:
+    """Render events as CSV in batches of rows"""
+    writer = csv.writer(_Echo())
+    chunk = [writer.writerow(_EVENT_CSV_FIELDS)]
+    for event in events:
+        chunk.append(writer.writerow((
+            event.event_id,
+            event.timestamp.isoformat(),
+            event.event_type,
+            event.user,
+            event.host,
+            event.action,
+            event.status,
+            event.run_id or "",
+            event.task_id or "",
+            event.duration or 0,
+            event.error or ""
+        )))
+        if len(chunk) >= _EXPORT_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+def _json_array(items: Iterator[Any]) -> Iterator[bytes]:
+    """Serialize dataclass records as a JSON array, one orjson call per batch"""
+    separator = b"["
+    while batch := list(islice(items, _EXPORT_BATCH_SIZE)):
+        # Drop the batch's own brackets and splice it into the outer array
+        yield separator + orjson.dumps(batch)[1:-1]
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def _export_json(meta: Dict[str, Any], events: Iterator[AuditEvent],
+                 executions: Iterator[TaskExecution]) -> Iterator[bytes]:
+    """Emit the export document without building it in memory"""
+    yield orjson.dumps(meta)[:-1] + b',"events":'
+    yield from _json_array(events)
+    yield b',"task_executions":'
+    yield from _json_array(executions)
+    yield b"}"
+
+
+async def _cached_result(request: Request, response: Response, audit_logger: AuditLogger,
+                         key: tuple, build: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Serve a cached result while the audit tables are unchanged
+    
+    The ETag is derived from the tables' rowid high-water marks and the
+    request key; a matching If-None-Match gets a 304 without recomputing.
+    """
+    version = await audit_logger.data_version()
+    etag = '"%s"' % hashlib.blake2b(
+        repr((version, _cleanup_generation, key)).encode(), digest_size=8
+    ).hexdigest()
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={_RESULT_CACHE_TTL}"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None and cached[0] == etag:
+        result = cached[1]
+    else:
+        result = await build()
+        _RESULT_CACHE[key] = (etag, result)
+    
+    response.headers.update(headers)
+    return result
@@ -2,22 +2,56 @@
 Health API Routes - Health check endpoints
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 
 from ...core.orchestrator import Orchestrator
 from ...core.inventory import Inventory
-from ...core.ssh_executor import SSHExecutor
+from ...core.ssh_executor import SSHExecutor, SSHResult
 from ...core.secrets import SecretsManager
-from ..dependencies import get_orchestrator, get_inventory, get_secrets_manager
+from ..dependencies import get_orchestrator, get_inventory, get_secrets_manager, get_ssh_executor
 
 
-router = APIRouter()
+# Health reports grow with the fleet; encode them with orjson wherever the router is mounted
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# Hosts checked at once by get_system_health, bounding open SSH connections
+# (and concurrent handshakes through a shared bastion's MaxStartups)
+_HOST_CHECK_CONCURRENCY = 50
 
-# Pydantic models
+# Seconds a single check (including connecting) may take before it is
+# reported as failed, so one unreachable host cannot stall /health
+_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+
+# Remote commands for the individual checks. The Splunk check echoes the
+# systemctl exit code so it survives being combined with other commands.
+_CMD_SPLUNK = "sudo systemctl is-active splunk >/dev/null 2>&1; echo $?"
+_CMD_DISK = "df -P /opt/splunk"
+
+# Both probes in one round trip, their outputs separated by a NUL byte
+_PROBE_SEPARATOR = "\0"
+_PROBE_COMMAND = f"{_CMD_SPLUNK}; printf '\\0'; {_CMD_DISK}"
+
+# Seconds a health result is reused: the system-wide view absorbs monitoring
+# polls, single-host results stay fresher
+_HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "15"))
+_HOST_HEALTH_CACHE_TTL = min(5.0, _HEALTH_CACHE_TTL)
+
+# Last result per key as (time.monotonic() when built, result); entries are
+# kept past their TTL so a failed rebuild can fall back to them
+_health_cache: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+
+
+# Pydantic models; responses are built from our own check results, so they
+# are created with model_construct and skip validation
 class HealthCheckResponse(BaseModel):
     check_name: str
     status: str
@@ -43,178 +77,337 @@ class SystemHealthResponse(BaseModel):
     summary: Dict[str, Any]
 
 
+def _failed_check(check_name: str, message: str, error: str) -> HealthCheckResponse:
+    """A failed check that produced no measurement"""
+    return HealthCheckResponse.model_construct(
+        check_name=check_name,
+        status="fail",
+        message=message,
+        duration=0.0,
+        details={"error": error}
+    )
+
+
+def _timed_out_check(check_name: str) -> HealthCheckResponse:
+    """A check abandoned after _CHECK_TIMEOUT seconds"""
+    return _failed_check(check_name, "timeout", f"No response within {_CHECK_TIMEOUT:g} seconds")
+
+
+def _splunk_check(output: str, result: SSHResult) -> HealthCheckResponse:
+    """Build the splunk_service check from the output of _CMD_SPLUNK"""
+    output = output.strip()
+    if not output.isdigit():
+        error = result.stderr.strip()
+        return _failed_check("splunk_service", f"Splunk service check failed: {error}", error)
+    
+    returncode = int(output)
+    return HealthCheckResponse.model_construct(
+        check_name="splunk_service",
+        status="pass" if returncode == 0 else "fail",
+        message="Splunk service is running" if returncode == 0 else "Splunk service is not running",
+        duration=result.duration,
+        details={"returncode": returncode}
+    )
+
+
+def _disk_check(output: str, result: SSHResult) -> HealthCheckResponse:
+    """Build the disk_space check from the output of _CMD_DISK"""
+    # POSIX df output: a header line, then one line whose fifth field is
+    # the capacity, e.g. "42%"
+    try:
+        disk_usage = int(output.splitlines()[1].split()[4].rstrip("%"))
+    except (IndexError, ValueError):
+        disk_usage = None
+    
+    if disk_usage is not None:
+        disk_status = "pass" if disk_usage < 90 else "warn"
+        disk_message = f"Disk usage: {disk_usage}%" if disk_usage < 90 else f"Disk usage high: {disk_usage}%"
+    else:
+        disk_status = "fail"
+        disk_message = "Failed to check disk usage"
+        disk_usage = 0
+    
+    return HealthCheckResponse.model_construct(
+        check_name="disk_space",
+        status=disk_status,
+        message=disk_message,
+        duration=result.duration,
+        details={"usage_percent": disk_usage}
+    )
+
+
+async def _check_ssh(ssh_executor: SSHExecutor, host) -> HealthCheckResponse:
+    """Check that the host accepts SSH connections"""
+    start_time = time.monotonic()
+    success = await ssh_executor.test_connection(host)
+    duration = time.monotonic() - start_time
+    
+    return HealthCheckResponse.model_construct(
+        check_name="ssh_connectivity",
+        status="pass" if success else "fail",
+        message="SSH connection successful" if success else "SSH connection failed",
+        duration=duration,
+        details={"host": host.name, "ip": host.ansible_host}
+    )
+
+
+async def _check_splunk(ssh_executor: SSHExecutor, host) -> HealthCheckResponse:
+    """Check that the Splunk service is active"""
+    result = await ssh_executor.execute_command(host, _CMD_SPLUNK)
+    return _splunk_check(result.stdout, result)
+
+
+async def _check_disk(ssh_executor: SSHExecutor, host) -> HealthCheckResponse:
+    """Check /opt/splunk disk usage"""
+    result = await ssh_executor.execute_command(host, _CMD_DISK)
+    return _disk_check(result.stdout, result)
+
+
+# Health checks by name, as accepted by POST /hosts/{host_name}/check
+CHECKS: Dict[str, Callable[[SSHExecutor, Any], Awaitable[HealthCheckResponse]]] = {
+    "ssh_connectivity": _check_ssh,
+    "splunk_service": _check_splunk,
+    "disk_space": _check_disk,
+}
+
+# Checks run when a request names none: every registered check
+_DEFAULT_CHECKS = tuple(CHECKS)
+
+
+async def _run_check(check_name: str, ssh_executor: SSHExecutor, host) -> HealthCheckResponse:
+    """Run a registered check, reporting unknown names and errors as failed checks"""
+    check = CHECKS.get(check_name)
+    if check is None:
+        return _failed_check(check_name, f"Unknown check type: {check_name}", "Unknown check type")
+    
+    try:
+        return await asyncio.wait_for(check(ssh_executor, host), timeout=_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        return _timed_out_check(check_name)
+    except Exception as e:
+        return _failed_check(check_name, f"Check failed: {str(e)}", str(e))
+
+
+async def _probe(ssh_executor: SSHExecutor, host) -> List[HealthCheckResponse]:
+    """Run the Splunk service and disk space checks in a single SSH round trip"""
+    try:
+        result = await asyncio.wait_for(
+            ssh_executor.execute_command(host, _PROBE_COMMAND), timeout=_CHECK_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return [_timed_out_check("splunk_service"), _timed_out_check("disk_space")]
+    except Exception as e:
+        return [
+            _failed_check("splunk_service", f"Check failed: {str(e)}", str(e)),
+            _failed_check("disk_space", f"Check failed: {str(e)}", str(e))
+        ]
+    
+    splunk_output, _, disk_output = result.stdout.partition(_PROBE_SEPARATOR)
+    return [_splunk_check(splunk_output, result), _disk_check(disk_output, result)]
+
+
+def _overall_status(checks: List[HealthCheckResponse]) -> str:
+    """Host status from its checks: any fail is unhealthy, else any warn is a warning"""
+    statuses = {check.status for check in checks}
+    if "fail" in statuses:
+        return "unhealthy"
+    if "warn" in statuses:
+        return "warning"
+    return "healthy"
+
+
+async def _check_host(host, ssh_executor: SSHExecutor, checked_at: str) -> HostHealthResponse:
+    """Run the connectivity, Splunk service and disk checks against one host"""
+    ssh_check = await _run_check("ssh_connectivity", ssh_executor, host)
+    checks = [ssh_check]
+    
+    # Additional checks if SSH is working
+    if ssh_check.status == "pass":
+        checks.extend(await _probe(ssh_executor, host))
+    
+    overall_status = _overall_status(checks)
+    return HostHealthResponse.model_construct(
+        host=host.name,
+        ip=host.ansible_host,
+        status=overall_status,
+        checks=checks,
+        overall_status=overall_status,
+        last_check=checked_at
+    )
+
+
+def _failed_host_health(host, error: Exception, checked_at: str) -> HostHealthResponse:
+    """Health entry for a host whose check raised"""
+    return HostHealthResponse.model_construct(
+        host=host.name,
+        ip=host.ansible_host,
+        status="unhealthy",
+        checks=[_failed_check("host_check", f"Host check failed: {str(error)}", str(error))],
+        overall_status="unhealthy",
+        last_check=checked_at
+    )
+
+
+def _host_checks(hosts, ssh_executor: SSHExecutor, checked_at: str) -> List[Awaitable[HostHealthResponse]]:
+    """One health check per host, at most _HOST_CHECK_CONCURRENCY running at once"""
+    semaphore = asyncio.Semaphore(_HOST_CHECK_CONCURRENCY)
+    
+    async def check_host(host):
+        async with semaphore:
+            try:
+                return await _check_host(host, ssh_executor, checked_at)
+            except Exception as e:
+                return _failed_host_health(host, e, checked_at)
+    
+    return [check_host(host) for host in hosts]
+
+
+async def _cached_health(response: Response, key: Tuple[str, ...], ttl: float,
+                         build: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Serve a health result built within the last `ttl` seconds
+    
+    Sets X-Cache to HIT, MISS, or STALE when a rebuild failed and the
+    previous result is served instead of an error.
+    """
+    entry = _health_cache.get(key)
+    if entry is not None:
+        age = time.monotonic() - entry[0]
+        if age < ttl:
+            response.headers["X-Cache"] = "HIT"
+            response.headers["Cache-Control"] = f"max-age={int(ttl - age)}"
+            return entry[1]
+    
+    try:
+        result = await build()
+    except Exception:
+        if entry is None:
+            raise
+        response.headers["X-Cache"] = "STALE"
+        response.headers["Cache-Control"] = "no-cache"
+        return entry[1]
+    
+    _health_cache[key] = (time.monotonic(), result)
+    response.headers["X-Cache"] = "MISS"
+    response.headers["Cache-Control"] = f"max-age={int(ttl)}"
+    return result
+
+
 @router.get("/", response_model=SystemHealthResponse)
 async def get_system_health(
+    response: Response,
+    summary_only: bool = Query(False, alias="summary", description="Return only the overall status and host counts"),
     orchestrator: Orchestrator = Depends(get_orchestrator),
     inventory: Inventory = Depends(get_inventory),
-    secrets_manager: SecretsManager = Depends(get_secrets_manager)
+    secrets_manager: SecretsManager = Depends(get_secrets_manager),
+    ssh_executor: SSHExecutor = Depends(get_ssh_executor)
 ):
     """Get overall system health"""
     try:
-        # Check component health
-        components = {
-            "orchestrator": "healthy" if orchestrator else "unhealthy",
-            "inventory": "healthy" if inventory else "unhealthy",
-            "secrets_manager": "healthy" if secrets_manager else "unhealthy"
-        }
-        
-        # Get all hosts
-        hosts = inventory.get_all_hosts()
-        
-        # Check host health
-        host_health = []
-        for host in hosts:
-            try:
-                # Basic connectivity check
-                ssh_executor = SSHExecutor(secrets_manager)
-                start_time = datetime.now()
-                
-                # Test connection
-                success = await ssh_executor.test_connection(host)
-                duration = (datetime.now() - start_time).total_seconds()
-                
-                checks = [
-                    HealthCheckResponse(
-                        check_name="ssh_connectivity",
-                        status="pass" if success else "fail",
-                        message="SSH connection successful" if success else "SSH connection failed",
-                        duration=duration,
-                        details={"host": host.name, "ip": host.ansible_host}
-                    )
-                ]
-                
-                # Additional checks if SSH is working
-                if success:
-                    # Check Splunk service
-                    try:
-                        splunk_check = await ssh_executor.execute_command(
-                            host, "sudo systemctl is-active splunk"
-                        )
-                        splunk_status = "pass" if splunk_check.returncode == 0 else "fail"
-                        splunk_message = "Splunk service is running" if splunk_check.returncode == 0 else "Splunk service is not running"
-                        
-                        checks.append(HealthCheckResponse(
-                            check_name="splunk_service",
-                            status=splunk_status,
-                            message=splunk_message,
-                            duration=0.1,  # Quick check
-                            details={"returncode": splunk_check.returncode}
-                        ))
-                    except Exception as e:
-                        checks.append(HealthCheckResponse(
-                            check_name="splunk_service",
-                            status="fail",
-                            message=f"Splunk service check failed: {str(e)}",
-                            duration=0.0,
-                            details={"error": str(e)}
-                        ))
-                    
-                    # Check disk space
-                    try:
-                        disk_check = await ssh_executor.execute_command(
-                            host, "df -h /opt/splunk | tail -1 | awk '{print $5}' | sed 's/%//'"
-                        )
-                        if disk_check.returncode == 0:
-                            disk_usage = int(disk_check.stdout.strip())
-                            disk_status = "pass" if disk_usage < 90 else "warn"
-                            disk_message = f"Disk usage: {disk_usage}%" if disk_usage < 90 else f"Disk usage high: {disk_usage}%"
-                        else:
-                            disk_status = "fail"
-                            disk_message = "Failed to check disk usage"
-                            disk_usage = 0
-                        
-                        checks.append(HealthCheckResponse(
-                            check_name="disk_space",
-                            status=disk_status,
-                            message=disk_message,
-                            duration=0.1,
-                            details={"usage_percent": disk_usage}
-                        ))
-                    except Exception as e:
-                        checks.append(HealthCheckResponse(
-                            check_name="disk_space",
-                            status="fail",
-                            message=f"Disk space check failed: {str(e)}",
-                            duration=0.0,
-                            details={"error": str(e)}
-                        ))
-                
-                # Determine overall host status
-                overall_status = "healthy"
-                if not success:
-                    overall_status = "unhealthy"
-                elif any(check.status == "fail" for check in checks):
-                    overall_status = "unhealthy"
-                elif any(check.status == "warn" for check in checks):
-                    overall_status = "warning"
-                
-                host_health.append(HostHealthResponse(
-                    host=host.name,
-                    ip=host.ansible_host,
-                    status=overall_status,
-                    checks=checks,
-                    overall_status=overall_status,
-                    last_check=datetime.now().isoformat()
-                ))
-                
-            except Exception as e:
-                # Host check failed
-                host_health.append(HostHealthResponse(
-                    host=host.name,
-                    ip=host.ansible_host,
-                    status="unhealthy",
-                    checks=[
-                        HealthCheckResponse(
-                            check_name="host_check",
-                            status="fail",
-                            message=f"Host check failed: {str(e)}",
-                            duration=0.0,
-                            details={"error": str(e)}
-                        )
-                    ],
-                    overall_status="unhealthy",
-                    last_check=datetime.now().isoformat()
-                ))
-        
-        # Calculate summary
-        total_hosts = len(host_health)
-        healthy_hosts = len([h for h in host_health if h.overall_status == "healthy"])
-        warning_hosts = len([h for h in host_health if h.overall_status == "warning"])
-        unhealthy_hosts = len([h for h in host_health if h.overall_status == "unhealthy"])
+        async def build_health():
+            # One timestamp for the whole report; every host is checked in
+            # the same pass
+            checked_at = datetime.now().isoformat()
+            
+            # Check component health
+            components = {
+                "orchestrator": "healthy" if orchestrator else "unhealthy",
+                "inventory": "healthy" if inventory else "unhealthy",
+                "secrets_manager": "healthy" if secrets_manager else "unhealthy"
+            }
+            
+            # Get all hosts
+            hosts = inventory.get_all_hosts()
+            
+            # Check host health; the checks are independent network I/O, so run
+            # them concurrently
+            host_health = await asyncio.gather(*_host_checks(hosts, ssh_executor, checked_at))
+            
+            # Calculate summary
+            status_counts = Counter(h.overall_status for h in host_health)
+            total_hosts = len(host_health)
+            healthy_hosts = status_counts["healthy"]
+            warning_hosts = status_counts["warning"]
+            unhealthy_hosts = status_counts["unhealthy"]
+            
+            # Determine overall system status
+            if unhealthy_hosts > 0:
+                system_status = "unhealthy"
+            elif warning_hosts > 0:
+                system_status = "warning"
+            else:
+                system_status = "healthy"
+            
+            summary = {
+                "total_hosts": total_hosts,
+                "healthy_hosts": healthy_hosts,
+                "warning_hosts": warning_hosts,
+                "unhealthy_hosts": unhealthy_hosts,
+                "health_percentage": (healthy_hosts / total_hosts * 100) if total_hosts > 0 else 0
+            }
+            
+            return SystemHealthResponse.model_construct(
+                status=system_status,
+                timestamp=checked_at,
+                components=components,
+                hosts=host_health,
+                summary=summary
+            )
         
-        # Determine overall system status
-        if unhealthy_hosts > 0:
-            system_status = "unhealthy"
-        elif warning_hosts > 0:
-            system_status = "warning"
-        else:
-            system_status = "healthy"
+        # Monitors poll this endpoint every few seconds; each rebuild fans
+        # out SSH to every host
+        report = await _cached_health(response, ("system",), _HEALTH_CACHE_TTL, build_health)
         
-        summary = {
-            "total_hosts": total_hosts,
-            "healthy_hosts": healthy_hosts,
-            "warning_hosts": warning_hosts,
-            "unhealthy_hosts": unhealthy_hosts,
-            "health_percentage": (healthy_hosts / total_hosts * 100) if total_hosts > 0 else 0
-        }
+        if summary_only:
+            # Same cached checks, without serializing every host's detail
+            return SystemHealthResponse.model_construct(
+                status=report.status,
+                timestamp=report.timestamp,
+                components=report.components,
+                hosts=[],
+                summary=report.summary
+            )
         
-        return SystemHealthResponse(
-            status=system_status,
-            timestamp=datetime.now().isoformat(),
-            components=components,
-            hosts=host_health,
-            summary=summary
-        )
+        return report
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get system health: {str(e)}")
 
 
+@router.get("/stream")
+async def stream_system_health(
+    inventory: Inventory = Depends(get_inventory),
+    ssh_executor: SSHExecutor = Depends(get_ssh_executor)
+):
+    """Stream host health as newline-delimited JSON, each host as soon as its checks finish"""
+    try:
+        hosts = inventory.get_all_hosts()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get system health: {str(e)}")
+    
+    async def host_lines():
+        tasks = [
+            asyncio.ensure_future(check)
+            for check in _host_checks(hosts, ssh_executor, datetime.now().isoformat())
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                host_health = await next_done
+                yield orjson.dumps(host_health.model_dump()) + b"\n"
+        finally:
+            # Stop checking the remaining hosts if the client goes away
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(host_lines(), media_type="application/x-ndjson")
+
+
 @router.get("/hosts/{host_name}", response_model=HostHealthResponse)
 async def get_host_health(
     host_name: str,
+    response: Response,
     inventory: Inventory = Depends(get_inventory),
-    secrets_manager: SecretsManager = Depends(get_secrets_manager)
+    ssh_executor: SSHExecutor = Depends(get_ssh_executor)
 ):
     """Get health status for a specific host"""
     try:
@@ -223,96 +416,9 @@ async def get_host_health(
         if not host:
             raise HTTPException(status_code=404, detail=f"Host '{host_name}' not found")
         
-        # Check host health
-        ssh_executor = SSHExecutor(secrets_manager)
-        start_time = datetime.now()
-        
-        # Test connection
-        success = await ssh_executor.test_connection(host)
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        checks = [
-            HealthCheckResponse(
-                check_name="ssh_connectivity",
-                status="pass" if success else "fail",
-                message="SSH connection successful" if success else "SSH connection failed",
-                duration=duration,
-                details={"host": host.name, "ip": host.ansible_host}
-            )
-        ]
-        
-        # Additional checks if SSH is working
-        if success:
-            # Check Splunk service
-            try:
-                splunk_check = await ssh_executor.execute_command(
-                    host, "sudo systemctl is-active splunk"
-                )
-                splunk_status = "pass" if splunk_check.returncode == 0 else "fail"
-                splunk_message = "Splunk service is running" if splunk_check.returncode == 0 else "Splunk service is not running"
-                
-                checks.append(HealthCheckResponse(
-                    check_name="splunk_service",
-                    status=splunk_status,
-                    message=splunk_message,
-                    duration=0.1,
-                    details={"returncode": splunk_check.returncode}
-                ))
-            except Exception as e:
-                checks.append(HealthCheckResponse(
-                    check_name="splunk_service",
-                    status="fail",
-                    message=f"Splunk service check failed: {str(e)}",
-                    duration=0.0,
-                    details={"error": str(e)}
-                ))
-            
-            # Check disk space
-            try:
-                disk_check = await ssh_executor.execute_command(
-                    host, "df -h /opt/splunk | tail -1 | awk '{print $5}' | sed 's/%//'"
-                )
-                if disk_check.returncode == 0:
-                    disk_usage = int(disk_check.stdout.strip())
-                    disk_status = "pass" if disk_usage < 90 else "warn"
-                    disk_message = f"Disk usage: {disk_usage}%" if disk_usage < 90 else f"Disk usage high: {disk_usage}%"
-                else:
-                    disk_status = "fail"
-                    disk_message = "Failed to check disk usage"
-                    disk_usage = 0
-                
-                checks.append(HealthCheckResponse(
-                    check_name="disk_space",
-                    status=disk_status,
-                    message=disk_message,
-                    duration=0.1,
-                    details={"usage_percent": disk_usage}
-                ))
-            except Exception as e:
-                checks.append(HealthCheckResponse(
-                    check_name="disk_space",
-                    status="fail",
-                    message=f"Disk space check failed: {str(e)}",
-                    duration=0.0,
-                    details={"error": str(e)}
-                ))
-        
-        # Determine overall host status
-        overall_status = "healthy"
-        if not success:
-            overall_status = "unhealthy"
-        elif any(check.status == "fail" for check in checks):
-            overall_status = "unhealthy"
-        elif any(check.status == "warn" for check in checks):
-            overall_status = "warning"
-        
-        return HostHealthResponse(
-            host=host.name,
-            ip=host.ansible_host,
-            status=overall_status,
-            checks=checks,
-            overall_status=overall_status,
-            last_check=datetime.now().isoformat()
+        return await _cached_health(
+            response, ("host", host.name), _HOST_HEALTH_CACHE_TTL,
+            lambda: _check_host(host, ssh_executor, datetime.now().isoformat())
         )
         
     except HTTPException:
@@ -326,7 +432,7 @@ async def run_host_health_check(
     host_name: str,
     check_types: Optional[List[str]] = Query(None, description="Specific checks to run"),
     inventory: Inventory = Depends(get_inventory),
-    secrets_manager: SecretsManager = Depends(get_secrets_manager)
+    ssh_executor: SSHExecutor = Depends(get_ssh_executor)
 ):
     """Run health checks on a specific host"""
     try:
@@ -335,115 +441,25 @@ async def run_host_health_check(
         if not host:
             raise HTTPException(status_code=404, detail=f"Host '{host_name}' not found")
         
-        # Run checks
-        ssh_executor = SSHExecutor(secrets_manager)
-        checks = []
+        checked_at = datetime.now().isoformat()
         
         # Default checks if none specified
-        if not check_types:
-            check_types = ["ssh_connectivity", "splunk_service", "disk_space"]
-        
-        for check_type in check_types:
-            try:
-                if check_type == "ssh_connectivity":
-                    start_time = datetime.now()
-                    success = await ssh_executor.test_connection(host)
-                    duration = (datetime.now() - start_time).total_seconds()
-                    
-                    checks.append(HealthCheckResponse(
-                        check_name="ssh_connectivity",
-                        status="pass" if success else "fail",
-                        message="SSH connection successful" if success else "SSH connection failed",
-                        duration=duration,
-                        details={"host": host.name, "ip": host.ansible_host}
-                    ))
-                
-                elif check_type == "splunk_service":
-                    try:
-                        splunk_check = await ssh_executor.execute_command(
-                            host, "sudo systemctl is-active splunk"
-                        )
-                        splunk_status = "pass" if splunk_check.returncode == 0 else "fail"
-                        splunk_message = "Splunk service is running" if splunk_check.returncode == 0 else "Splunk service is not running"
-                        
-                        checks.append(HealthCheckResponse(
-                            check_name="splunk_service",
-                            status=splunk_status,
-                            message=splunk_message,
-                            duration=0.1,
-                            details={"returncode": splunk_check.returncode}
-                        ))
-                    except Exception as e:
-                        checks.append(HealthCheckResponse(
-                            check_name="splunk_service",
-                            status="fail",
-                            message=f"Splunk service check failed: {str(e)}",
-                            duration=0.0,
-                            details={"error": str(e)}
-                        ))
-                
-                elif check_type == "disk_space":
-                    try:
-                        disk_check = await ssh_executor.execute_command(
-                            host, "df -h /opt/splunk | tail -1 | awk '{print $5}' | sed 's/%//'"
-                        )
-                        if disk_check.returncode == 0:
-                            disk_usage = int(disk_check.stdout.strip())
-                            disk_status = "pass" if disk_usage < 90 else "warn"
-                            disk_message = f"Disk usage: {disk_usage}%" if disk_usage < 90 else f"Disk usage high: {disk_usage}%"
-                        else:
-                            disk_status = "fail"
-                            disk_message = "Failed to check disk usage"
-                            disk_usage = 0
-                        
-                        checks.append(HealthCheckResponse(
-                            check_name="disk_space",
-                            status=disk_status,
-                            message=disk_message,
-                            duration=0.1,
-                            details={"usage_percent": disk_usage}
-                        ))
-                    except Exception as e:
-                        checks.append(HealthCheckResponse(
-                            check_name="disk_space",
-                            status="fail",
-                            message=f"Disk space check failed: {str(e)}",
-                            duration=0.0,
-                            details={"error": str(e)}
-                        ))
-                
-                else:
-                    checks.append(HealthCheckResponse(
-                        check_name=check_type,
-                        status="fail",
-                        message=f"Unknown check type: {check_type}",
-                        duration=0.0,
-                        details={"error": "Unknown check type"}
-                    ))
-                    
-            except Exception as e:
-                checks.append(HealthCheckResponse(
-                    check_name=check_type,
-                    status="fail",
-                    message=f"Check failed: {str(e)}",
-                    duration=0.0,
-                    details={"error": str(e)}
-                ))
+        check_types = check_types or _DEFAULT_CHECKS
         
-        # Determine overall status
-        overall_status = "healthy"
-        if any(check.status == "fail" for check in checks):
-            overall_status = "unhealthy"
-        elif any(check.status == "warn" for check in checks):
-            overall_status = "warning"
+        # The checks are independent, so run them concurrently; results keep
+        # the requested order
+        checks = await asyncio.gather(*(
+            _run_check(check_type, ssh_executor, host) for check_type in check_types
+        ))
         
+        overall_status = _overall_status(checks)
         return {
             "host": host.name,
             "ip": host.ansible_host,
             "status": overall_status,
             "checks": checks,
             "overall_status": overall_status,
-            "last_check": datetime.now().isoformat()
+            "last_check": checked_at
         }
         
     except HTTPException:
@@ -7,6 +7,7 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from fastapi.websockets import WebSocketState
 import json
 import asyncio
+import orjson
 import logging
 from datetime import datetime
 
@@ -69,7 +70,7 @@ class ConnectionManager:
     
     async def send_json(self, data: Dict[str, Any], websocket: WebSocket = None):
         """Send JSON data to WebSocket(s)"""
-        message = json.dumps(data)
+        message = orjson.dumps(data).decode()
         if websocket:
             await self.send_personal_message(message, websocket)
         else:
@@ -310,45 +311,45 @@ async def websocket_logs(websocket: WebSocket):
 # Utility functions for broadcasting updates
 async def broadcast_run_update(run_id: str, status: str, progress: float, message: str = None):
     """Broadcast run update to all run subscribers"""
-    await manager.broadcast(json.dumps({
+    await manager.broadcast(orjson.dumps({
         "type": "run_update",
         "run_id": run_id,
         "status": status,
         "progress": progress,
         "message": message,
         "timestamp": datetime.now().isoformat()
-    }), "runs")
+    }).decode(), "runs")
 
 
 async def broadcast_host_update(host_name: str, status: str, message: str = None):
     """Broadcast host update to all host subscribers"""
-    await manager.broadcast(json.dumps({
+    await manager.broadcast(orjson.dumps({
         "type": "host_update",
         "host_name": host_name,
         "status": status,
         "message": message,
         "timestamp": datetime.now().isoformat()
-    }), "hosts")
+    }).decode(), "hosts")
 
 
 async def broadcast_log_entry(log_entry: Dict[str, Any]):
     """Broadcast log entry to all log subscribers"""
-    await manager.broadcast(json.dumps({
+    await manager.broadcast(orjson.dumps({
         "type": "log_entry",
         "log": log_entry,
         "timestamp": datetime.now().isoformat()
-    }), "logs")
+    }).decode(), "logs")
 
 
 async def broadcast_system_alert(alert_type: str, message: str, severity: str = "info"):
     """Broadcast system alert to all connections"""
-    await manager.broadcast(json.dumps({
+    await manager.broadcast(orjson.dumps({
         "type": "system_alert",
         "alert_type": alert_type,
         "message": message,
         "severity": severity,
         "timestamp": datetime.now().isoformat()
-    }))
+    }).decode())
 
 
 # Background task for periodic updates
@@ -357,11 +358,11 @@ async def periodic_updates():
     while True:
         try:
             # Send heartbeat to all connections
-            await manager.broadcast(json.dumps({
+            await manager.broadcast(orjson.dumps({
                 "type": "heartbeat",
                 "timestamp": datetime.now().isoformat(),
                 "connections": manager.get_connection_count()
-            }))
+            }).decode())
             
             # Wait 30 seconds before next update
             await asyncio.sleep(30)
@@ -2,16 +2,28 @@
 Siemply Audit Logger - Immutable audit logging and reporting
 """
 
+import asyncio
 import logging
 import json
 import os
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import sqlite3
+from contextlib import closing
 import hashlib
 
 
+# Rows fetched per round trip when streaming query results
+_FETCH_BATCH_SIZE = 1000
+
+# audit_events columns that aggregate_events may group by
+_EVENT_GROUP_COLUMNS = frozenset({'event_type', 'user', 'host', 'action', 'status', 'run_id'})
+
+# Rows removed per transaction by cleanup_old_events, so writers are never locked out for long
+_CLEANUP_CHUNK_SIZE = 10000
+
+
 @dataclass
 class AuditEvent:
     """Represents an audit event"""
@@ -117,6 +129,7 @@ class AuditLogger:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_executions_run_id ON task_executions(run_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_executions_host ON task_executions(host)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_executions_status ON task_executions(status)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_executions_start_time ON task_executions(start_time)")
                 
                 conn.commit()
                 
@@ -302,64 +315,154 @@ class AuditLogger:
             with sqlite3.connect(self.audit_db) as conn:
                 cursor = conn.cursor()
                 
-                # Build query
-                query = "SELECT * FROM audit_events WHERE 1=1"
-                params = []
-                
-                if start_time:
-                    query += " AND timestamp >= ?"
-                    params.append(start_time.isoformat())
-                
-                if end_time:
-                    query += " AND timestamp <= ?"
-                    params.append(end_time.isoformat())
-                
-                if event_type:
-                    query += " AND event_type = ?"
-                    params.append(event_type)
-                
-                if user:
-                    query += " AND user = ?"
-                    params.append(user)
-                
-                if host:
-                    query += " AND host = ?"
-                    params.append(host)
-                
-                if run_id:
-                    query += " AND run_id = ?"
-                    params.append(run_id)
-                
-                query += " ORDER BY timestamp DESC LIMIT ?"
-                params.append(limit)
-                
+                query, params = self._events_query(start_time, end_time, event_type, user, host, run_id, limit)
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                events = []
-                for row in rows:
-                    event = AuditEvent(
-                        event_id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        event_type=row[2],
-                        user=row[3],
-                        host=row[4],
-                        action=row[5],
-                        status=row[6],
-                        details=json.loads(row[7]),
-                        run_id=row[8],
-                        task_id=row[9],
-                        duration=row[10],
-                        error=row[11]
-                    )
-                    events.append(event)
                 
-                return events
+                return [self._row_to_event(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             self.logger.error(f"Failed to get audit events: {e}")
             return []
     
+    def iter_events(self, start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None,
+                    limit: Optional[int] = None) -> Iterator[AuditEvent]:
+        """
+        Yield audit events newest first, one keyset page at a time
+        
+        Each page uses its own short-lived connection, so the iterator can be
+        advanced from any thread (e.g. behind a StreamingResponse).
+        """
+        return self._paginate(
+            lambda after, batch: self.get_events_after(after, start_time, end_time, batch), limit
+        )
+    
+    def get_events_after(self, after: Optional[Tuple[str, int]] = None,
+                         start_time: Optional[datetime] = None,
+                         end_time: Optional[datetime] = None,
+                         batch: int = _FETCH_BATCH_SIZE) -> Tuple[List[AuditEvent], Optional[Tuple[str, int]]]:
+        """
+        Get one page of audit events, newest first
+        
+        Args:
+            after: Keyset cursor returned with the previous page (None for the first page)
+            start_time: Start time filter
+            end_time: End time filter
+            batch: Page size
+            
+        Returns:
+            The page of events and the cursor for the next page (None after the last page)
+        """
+        where = "1=1"
+        params = []
+        
+        if start_time:
+            where += " AND timestamp >= ?"
+            params.append(start_time.isoformat())
+        
+        if end_time:
+            where += " AND timestamp <= ?"
+            params.append(end_time.isoformat())
+        
+        rows, next_after = self._fetch_page("audit_events", "timestamp", where, params, after, batch)
+        return [self._row_to_event(row) for row in rows], next_after
+    
+    def _fetch_page(self, table: str, order_column: str, where: str, params: List[Any],
+                    after: Optional[Tuple[str, int]], batch: int) -> Tuple[List[tuple], Optional[Tuple[str, int]]]:
+        """
+        Fetch one page ordered by (order_column, rowid) descending
+        
+        Seeking past the previous page's last key keeps every page an index
+        range scan, however deep into the table it is.
+        """
+        query = f"SELECT rowid, {order_column}, * FROM {table} WHERE {where}"
+        params = list(params)
+        
+        if after is not None:
+            query += f" AND ({order_column}, rowid) < (?, ?)"
+            params.extend(after)
+        
+        query += f" ORDER BY {order_column} DESC, rowid DESC LIMIT ?"
+        params.append(batch)
+        
+        with sqlite3.connect(self.audit_db) as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        next_after = (rows[-1][1], rows[-1][0]) if len(rows) == batch else None
+        return [row[2:] for row in rows], next_after
+    
+    @staticmethod
+    def _paginate(fetch_page, limit: Optional[int]) -> Iterator[Any]:
+        """Yield records from successive pages until exhausted or `limit` is reached"""
+        after = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch = _FETCH_BATCH_SIZE if remaining is None else min(_FETCH_BATCH_SIZE, remaining)
+            records, after = fetch_page(after, batch)
+            yield from records
+            if after is None:
+                return
+            if remaining is not None:
+                remaining -= len(records)
+    
+    def _events_query(self, start_time: Optional[datetime] = None,
+                      end_time: Optional[datetime] = None,
+                      event_type: Optional[str] = None,
+                      user: Optional[str] = None,
+                      host: Optional[str] = None,
+                      run_id: Optional[str] = None,
+                      limit: int = 1000) -> Tuple[str, List[Any]]:
+        """Build the filtered audit_events query"""
+        query = "SELECT * FROM audit_events WHERE 1=1"
+        params = []
+        
+        if start_time:
+            query += " AND timestamp >= ?"
+            params.append(start_time.isoformat())
+        
+        if end_time:
+            query += " AND timestamp <= ?"
+            params.append(end_time.isoformat())
+        
+        if event_type:
+            query += " AND event_type = ?"
+            params.append(event_type)
+        
+        if user:
+            query += " AND user = ?"
+            params.append(user)
+        
+        if host:
+            query += " AND host = ?"
+            params.append(host)
+        
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        
+        return query, params
+    
+    @staticmethod
+    def _row_to_event(row: tuple) -> AuditEvent:
+        """Convert an audit_events row to an AuditEvent"""
+        return AuditEvent(
+            event_id=row[0],
+            timestamp=datetime.fromisoformat(row[1]),
+            event_type=row[2],
+            user=row[3],
+            host=row[4],
+            action=row[5],
+            status=row[6],
+            details=json.loads(row[7]),
+            run_id=row[8],
+            task_id=row[9],
+            duration=row[10],
+            error=row[11]
+        )
+    
     async def get_task_executions(self, run_id: Optional[str] = None,
                                  host: Optional[str] = None,
                                  status: Optional[str] = None,
@@ -380,53 +483,174 @@ class AuditLogger:
             with sqlite3.connect(self.audit_db) as conn:
                 cursor = conn.cursor()
                 
-                # Build query
-                query = "SELECT * FROM task_executions WHERE 1=1"
-                params = []
-                
-                if run_id:
-                    query += " AND run_id = ?"
-                    params.append(run_id)
-                
-                if host:
-                    query += " AND host = ?"
-                    params.append(host)
-                
-                if status:
-                    query += " AND status = ?"
-                    params.append(status)
-                
-                query += " ORDER BY start_time DESC LIMIT ?"
-                params.append(limit)
-                
+                query, params = self._task_executions_query(run_id, host, status, limit)
                 cursor.execute(query, params)
-                rows = cursor.fetchall()
-                
-                executions = []
-                for row in rows:
-                    execution = TaskExecution(
-                        task_id=row[0],
-                        run_id=row[1],
-                        host=row[2],
-                        task_name=row[3],
-                        task_type=row[4],
-                        start_time=datetime.fromisoformat(row[5]),
-                        end_time=datetime.fromisoformat(row[6]),
-                        duration=row[7],
-                        status=row[8],
-                        output=row[9],
-                        error=row[10],
-                        changed=bool(row[11]),
-                        facts=json.loads(row[12]) if row[12] else {}
-                    )
-                    executions.append(execution)
                 
-                return executions
+                return [self._row_to_execution(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             self.logger.error(f"Failed to get task executions: {e}")
             return []
     
+    def iter_task_executions(self, limit: Optional[int] = None) -> Iterator[TaskExecution]:
+        """Yield task executions newest first, one keyset page at a time"""
+        return self._paginate(self.get_task_executions_after, limit)
+    
+    def get_task_executions_after(self, after: Optional[Tuple[str, int]] = None,
+                                  batch: int = _FETCH_BATCH_SIZE) -> Tuple[List[TaskExecution], Optional[Tuple[str, int]]]:
+        """Get one page of task executions, newest first; see get_events_after"""
+        rows, next_after = self._fetch_page("task_executions", "start_time", "1=1", [], after, batch)
+        return [self._row_to_execution(row) for row in rows], next_after
+    
+    def _task_executions_query(self, run_id: Optional[str] = None,
+                               host: Optional[str] = None,
+                               status: Optional[str] = None,
+                               limit: int = 1000) -> Tuple[str, List[Any]]:
+        """Build the filtered task_executions query"""
+        query = "SELECT * FROM task_executions WHERE 1=1"
+        params = []
+        
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        
+        if host:
+            query += " AND host = ?"
+            params.append(host)
+        
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        
+        query += " ORDER BY start_time DESC LIMIT ?"
+        params.append(limit)
+        
+        return query, params
+    
+    @staticmethod
+    def _row_to_execution(row: tuple) -> TaskExecution:
+        """Convert a task_executions row to a TaskExecution"""
+        return TaskExecution(
+            task_id=row[0],
+            run_id=row[1],
+            host=row[2],
+            task_name=row[3],
+            task_type=row[4],
+            start_time=datetime.fromisoformat(row[5]),
+            end_time=datetime.fromisoformat(row[6]),
+            duration=row[7],
+            status=row[8],
+            output=row[9],
+            error=row[10],
+            changed=bool(row[11]),
+            facts=json.loads(row[12]) if row[12] else {}
+        )
+    
+    async def aggregate_events(self, start_time: Optional[datetime] = None,
+                               end_time: Optional[datetime] = None,
+                               group_by: tuple = ('status', 'user', 'host', 'event_type')) -> Dict[str, Dict[str, int]]:
+        """
+        Count audit events per distinct value of each grouping column
+        
+        Args:
+            start_time: Start time filter
+            end_time: End time filter
+            group_by: Columns to count by (see _EVENT_GROUP_COLUMNS)
+            
+        Returns:
+            Mapping of column name to {value: count}
+        """
+        invalid = set(group_by) - _EVENT_GROUP_COLUMNS
+        if invalid:
+            raise ValueError(f"Unsupported group_by columns: {sorted(invalid)}")
+        
+        where = "WHERE 1=1"
+        params = []
+        
+        if start_time:
+            where += " AND timestamp >= ?"
+            params.append(start_time.isoformat())
+        
+        if end_time:
+            where += " AND timestamp <= ?"
+            params.append(end_time.isoformat())
+        
+        try:
+            # Run the blocking queries off the event loop so callers can overlap them
+            return await asyncio.to_thread(self._count_events, where, params, group_by)
+        except Exception as e:
+            self.logger.error(f"Failed to aggregate audit events: {e}")
+            raise
+    
+    def _count_events(self, where: str, params: List[Any], group_by: tuple) -> Dict[str, Dict[str, int]]:
+        """Run one GROUP BY count per column over a single connection"""
+        with sqlite3.connect(self.audit_db) as conn:
+            cursor = conn.cursor()
+            
+            counts = {}
+            for column in group_by:
+                cursor.execute(
+                    f"SELECT {column}, COUNT(*) FROM audit_events {where} GROUP BY {column}",
+                    params
+                )
+                counts[column] = dict(cursor.fetchall())
+            
+            return counts
+    
+    async def aggregate_task_executions(self) -> Dict[str, Any]:
+        """
+        Summarize task executions by status
+        
+        Returns:
+            Total count, average duration and {status: count}
+        """
+        try:
+            return await asyncio.to_thread(self._summarize_task_executions)
+        except Exception as e:
+            self.logger.error(f"Failed to aggregate task executions: {e}")
+            raise
+    
+    def _summarize_task_executions(self) -> Dict[str, Any]:
+        """Count task executions and sum their durations per status"""
+        with sqlite3.connect(self.audit_db) as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT status, COUNT(*), SUM(duration)
+                FROM task_executions
+                GROUP BY status
+            """)
+            
+            status_counts = {}
+            total = 0
+            total_duration = 0.0
+            for status, count, duration_sum in cursor.fetchall():
+                status_counts[status] = count
+                total += count
+                total_duration += duration_sum or 0.0
+            
+            return {
+                'total': total,
+                'avg_duration': total_duration / total if total else 0,
+                'status_counts': status_counts
+            }
+    
+    async def data_version(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Cheap change marker for cached aggregates
+        
+        Returns:
+            Highest rowid in audit_events and in task_executions
+        """
+        return await asyncio.to_thread(self._max_rowids)
+    
+    def _max_rowids(self) -> Tuple[Optional[int], Optional[int]]:
+        """Read the rowid high-water marks used by data_version"""
+        with closing(sqlite3.connect(self.audit_db)) as conn:
+            return conn.execute(
+                "SELECT (SELECT MAX(rowid) FROM audit_events), (SELECT MAX(rowid) FROM task_executions)"
+            ).fetchone()
+    
     async def get_run_summary(self, run_id: str) -> Dict[str, Any]:
         """
         Get summary of a run
@@ -502,7 +726,8 @@ class AuditLogger:
     
     async def generate_audit_report(self, start_time: Optional[datetime] = None,
                                    end_time: Optional[datetime] = None,
-                                   format: str = 'json') -> Union[Dict[str, Any], str]:
+                                   format: str = 'json',
+                                   include_records: bool = True) -> Union[Dict[str, Any], str]:
         """
         Generate audit report
         
@@ -510,55 +735,28 @@ class AuditLogger:
             start_time: Start time filter
             end_time: End time filter
             format: Report format (json, markdown, html)
+            include_records: Include the raw events and executions in JSON reports
             
         Returns:
             Audit report
         """
         try:
-            # Get events
-            events = await self.get_events(start_time, end_time, limit=10000)
-            
-            # Get task executions
-            task_executions = await self.get_task_executions(limit=10000)
-            
-            # Generate summary statistics
-            total_events = len(events)
-            total_tasks = len(task_executions)
-            
-            # Count by status
-            event_status_counts = {}
-            for event in events:
-                status = event.status
-                event_status_counts[status] = event_status_counts.get(status, 0) + 1
-            
-            task_status_counts = {}
-            for execution in task_executions:
-                status = execution.status
-                task_status_counts[status] = task_status_counts.get(status, 0) + 1
-            
-            # Count by user
-            user_counts = {}
-            for event in events:
-                user = event.user
-                user_counts[user] = user_counts.get(user, 0) + 1
+            # Count in the database instead of loading every row
+            event_counts, task_summary = await asyncio.gather(
+                self.aggregate_events(start_time, end_time),
+                self.aggregate_task_executions()
+            )
             
-            # Count by host
-            host_counts = {}
-            for event in events:
-                host = event.host
-                host_counts[host] = host_counts.get(host, 0) + 1
-            
-            # Count by event type
-            event_type_counts = {}
-            for event in events:
-                event_type = event.event_type
-                event_type_counts[event_type] = event_type_counts.get(event_type, 0) + 1
-            
-            # Calculate average task duration
-            avg_task_duration = 0
-            if task_executions:
-                total_duration = sum(execution.duration for execution in task_executions)
-                avg_task_duration = total_duration / len(task_executions)
+            # Full records are only included in the JSON form when requested;
+            # they are converted page by page so only one page of dataclasses
+            # is alive alongside the output dicts
+            events = []
+            task_executions = []
+            if format == 'json' and include_records:
+                events, task_executions = await asyncio.gather(
+                    asyncio.to_thread(self._records_as_dicts, self.iter_events(start_time, end_time, limit=10000)),
+                    asyncio.to_thread(self._records_as_dicts, self.iter_task_executions(limit=10000))
+                )
             
             # Generate report data
             report_data = {
@@ -568,17 +766,17 @@ class AuditLogger:
                     'end_time': end_time.isoformat() if end_time else None
                 },
                 'summary': {
-                    'total_events': total_events,
-                    'total_tasks': total_tasks,
-                    'avg_task_duration': avg_task_duration
+                    'total_events': sum(event_counts['status'].values()),
+                    'total_tasks': task_summary['total'],
+                    'avg_task_duration': task_summary['avg_duration']
                 },
-                'event_status_counts': event_status_counts,
-                'task_status_counts': task_status_counts,
-                'user_counts': user_counts,
-                'host_counts': host_counts,
-                'event_type_counts': event_type_counts,
-                'events': [asdict(event) for event in events],
-                'task_executions': [asdict(execution) for execution in task_executions]
+                'event_status_counts': event_counts['status'],
+                'task_status_counts': task_summary['status_counts'],
+                'user_counts': event_counts['user'],
+                'host_counts': event_counts['host'],
+                'event_type_counts': event_counts['event_type'],
+                'events': events,
+                'task_executions': task_executions
             }
             
             if format == 'json':
@@ -594,6 +792,11 @@ class AuditLogger:
             self.logger.error(f"Failed to generate audit report: {e}")
             return {}
     
+    @staticmethod
+    def _records_as_dicts(records: Iterator[Any]) -> List[Dict[str, Any]]:
+        """Drain a paginated record iterator into plain dicts"""
+        return [asdict(record) for record in records]
+    
     def _generate_markdown_report(self, report_data: Dict[str, Any]) -> str:
         """Generate Markdown audit report"""
         md = f"""# Siemply Audit Report
@@ -745,27 +948,34 @@ class AuditLogger:
         
         return html
     
-    async def cleanup_old_events(self, days: int = 90):
-        """Clean up old audit events"""
+    async def cleanup_old_events(self, days: int = 90, chunk_size: int = _CLEANUP_CHUNK_SIZE):
+        """Clean up old audit events, deleting in chunks and yielding to the event loop between them"""
         try:
             cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
             cutoff_iso = datetime.fromtimestamp(cutoff_date).isoformat()
             
-            with sqlite3.connect(self.audit_db) as conn:
-                cursor = conn.cursor()
-                
-                # Delete old events
-                cursor.execute("DELETE FROM audit_events WHERE timestamp < ?", (cutoff_iso,))
-                events_deleted = cursor.rowcount
-                
-                # Delete old task executions
-                cursor.execute("DELETE FROM task_executions WHERE start_time < ?", (cutoff_iso,))
-                tasks_deleted = cursor.rowcount
-                
-                conn.commit()
-                
-                self.logger.info(f"Cleaned up {events_deleted} events and {tasks_deleted} task executions older than {days} days")
-                
+            deleted = {}
+            for table, column in (('audit_events', 'timestamp'), ('task_executions', 'start_time')):
+                deleted[table] = 0
+                while True:
+                    count = await asyncio.to_thread(self._delete_chunk, table, column, cutoff_iso, chunk_size)
+                    deleted[table] += count
+                    if count < chunk_size:
+                        break
+                    await asyncio.sleep(0)
+            
+            self.logger.info(f"Cleaned up {deleted['audit_events']} events and {deleted['task_executions']} task executions older than {days} days")
+            
         except Exception as e:
             self.logger.error(f"Failed to cleanup old events: {e}")
             raise
+    
+    def _delete_chunk(self, table: str, column: str, cutoff_iso: str, chunk_size: int) -> int:
+        """Delete up to chunk_size rows of table older than cutoff_iso in one transaction"""
+        with sqlite3.connect(self.audit_db) as conn:
+            cursor = conn.execute(
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} WHERE {column} < ? LIMIT ?)",
+                (cutoff_iso, chunk_size)
+            )
+            return cursor.rowcount
@@ -4,6 +4,7 @@ Siemply Inventory - Host and group management
 
 import logging
 import yaml
+from collections import Counter
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 import os
@@ -386,25 +387,13 @@ class Inventory:
         summary = {
             'total_hosts': len(self.all_hosts),
             'total_groups': len(self.groups),
-            'hosts_by_splunk_type': {},
-            'hosts_by_os_family': {},
-            'hosts_by_group': {}
+            # Count by Splunk type and OS family
+            'hosts_by_splunk_type': dict(Counter(host.splunk_type or 'unknown' for host in self.all_hosts)),
+            'hosts_by_os_family': dict(Counter(host.os_family or 'unknown' for host in self.all_hosts)),
+            # Count by group
+            'hosts_by_group': {group_name: len(group.hosts) for group_name, group in self.groups.items()}
         }
         
-        # Count by Splunk type
-        for host in self.all_hosts:
-            splunk_type = host.splunk_type or 'unknown'
-            summary['hosts_by_splunk_type'][splunk_type] = summary['hosts_by_splunk_type'].get(splunk_type, 0) + 1
-        
-        # Count by OS family
-        for host in self.all_hosts:
-            os_family = host.os_family or 'unknown'
-            summary['hosts_by_os_family'][os_family] = summary['hosts_by_os_family'].get(os_family, 0) + 1
-        
-        # Count by group
-        for group_name, group in self.groups.items():
-            summary['hosts_by_group'][group_name] = len(group.hosts)
-        
         return summary
     
     def validate_inventory(self) -> List[str]:
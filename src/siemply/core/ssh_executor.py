@@ -32,8 +32,9 @@ class SSHExecutor:
         self.secrets = secrets_manager
         self.logger = logging.getLogger(__name__)
         
-        # SSH connection cache
+        # SSH connection cache, shared by every command run against a host
         self.connections: Dict[str, asyncssh.SSHClientConnection] = {}
+        self._connection_locks: Dict[str, asyncio.Lock] = {}
         
         # Load SSH profiles
         self.ssh_profiles = {}
@@ -71,10 +72,27 @@ class SSHExecutor:
         """
         host_id = host.get('ansible_host', host.get('name', 'unknown'))
         
-        # Check if connection already exists
-        if host_id in self.connections:
-            return self.connections[host_id]
+        # Reuse a live connection; each command opens a new channel on it
+        connection = self.connections.get(host_id)
+        if connection is not None and not connection.is_closed():
+            return connection
         
+        # Concurrent callers for the same host wait for a single handshake
+        lock = self._connection_locks.get(host_id)
+        if lock is None:
+            lock = self._connection_locks[host_id] = asyncio.Lock()
+        async with lock:
+            connection = self.connections.get(host_id)
+            if connection is not None:
+                if not connection.is_closed():
+                    return connection
+                del self.connections[host_id]
+            
+            return await self._connect(host, host_id, profile_name)
+    
+    async def _connect(self, host: Dict[str, Any], host_id: str,
+                       profile_name: Optional[str] = None) -> asyncssh.SSHClientConnection:
+        """Open a new SSH connection to host and add it to the cache"""
         # Determine profile to use
         if not profile_name:
             # Try to determine from host environment
@@ -422,6 +440,7 @@ class SSHExecutor:
             try:
                 await self.connections[host_id].close()
                 del self.connections[host_id]
+                self._connection_locks.pop(host_id, None)
                 self.logger.info(f"SSH connection closed for {host_id}")
             except Exception as e:
                 self.logger.warning(f"Error closing connection to {host_id}: {e}")
@@ -435,6 +454,7 @@ class SSHExecutor:
             except Exception as e:
                 self.logger.warning(f"Error closing connection to {host_id}: {e}")
         
+        self._connection_locks.clear()
         self.logger.info("All SSH connections closed")
     
     async def get_host_info(self, host: Dict[str, Any], profile_name: Optional[str] = None) -> Dict[str, Any]:
@@ -0,0 +1,37 @@
+"""
+Tests for the API's queued log handlers
+"""
+
+import io
+import logging
+
+import pytest
+
+pytest.importorskip("fastapi")
+uvicorn_logging = pytest.importorskip("uvicorn.logging")
+
+from siemply.api.main import _queued_log_handlers
+
+
+def test_access_log_lines_are_formatted_through_the_queue():
+    """uvicorn's access formatter unpacks record.args, so they must survive the queue"""
+    logger = logging.getLogger("uvicorn.access")
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(uvicorn_logging.AccessFormatter(
+        '%(client_addr)s - "%(request_line)s" %(status_code)s', use_colors=False
+    ))
+    saved_handlers, saved_level = logger.handlers[:], logger.level
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    
+    try:
+        with _queued_log_handlers("uvicorn.access"):
+            # The same call uvicorn's protocol handlers make per request
+            logger.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:50000", "GET", "/api/status", "1.1", 200)
+            assert logger.handlers != [handler]
+    finally:
+        logger.handlers = saved_handlers
+        logger.setLevel(saved_level)
+    
+    assert stream.getvalue() == '127.0.0.1:50000 - "GET /api/status HTTP/1.1" 200 OK\n'